@@ -0,0 +1,173 @@
+"""Точность и скорость обратных преобразований ColorConversion
+
+Исходные цвета - равномерная сетка по кубу sRGB с шагом --step. Для каждого
+цвета считается эталонный Lab, затем выполняются те же круги, что в
+ColorConversion.main:
+
+    LCH→LAB  Lab -> LCH -> Lab
+    RGB→LAB  Lab -> RGB -> Lab
+    HSB→LAB  RGB -> HSB -> RGB -> Lab
+    HSI→LAB  RGB -> HSI -> RGB -> Lab
+
+Каждый круг проходит скалярными функциями (на случайной подвыборке сетки -
+colormath медленный) и векторными на всей сетке. Выводятся статистика ΔE2000
+относительно эталона, скорость в цветах в секунду и максимальное расхождение
+скалярного и векторного результатов на общей подвыборке.
+
+Скалярный lab_to_rgb читает Lab как D50 (умолчание colormath), а rgb_to_lab
+дает D65, поэтому круг RGB→LAB в обоих путях идет с осветителем D50 - так же,
+как в main.
+
+Пример:
+    python ColorBenchmark.py --step 5 --scalar-samples 5000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import ColorConversion as cc
+
+# Осветитель, с которым скалярный lab_to_rgb интерпретирует Lab
+SCALAR_LAB_TO_RGB_ILLUMINANT = "d50"
+
+
+def srgb_grid(step):
+    """Сетка цветов по кубу sRGB (N, 3), включая 255 на каждой оси"""
+    axis = np.unique(np.append(np.arange(0, 256, step), 255)).astype(np.float64)
+    r, g, b = np.meshgrid(axis, axis, axis, indexing="ij")
+    return np.stack([r.ravel(), g.ravel(), b.ravel()], axis=-1)
+
+
+def _scalar_map(func, colors):
+    return np.array([func(tuple(color)) for color in colors], dtype=np.float64)
+
+
+def scalar_round_trips(rgb, lab):
+    """Результаты кругов скалярными функциями, {название: Lab (N, 3)}"""
+    return {
+        "LCH→LAB": lambda: _scalar_map(cc.lch_to_lab, _scalar_map(cc.lab_to_lch, lab)),
+        "RGB→LAB": lambda: _scalar_map(cc.rgb_to_lab, _scalar_map(cc.lab_to_rgb, lab)),
+        "HSB→LAB": lambda: _scalar_map(
+            cc.rgb_to_lab, _scalar_map(cc.hsb_to_rgb, _scalar_map(cc.rgb_to_hsb, rgb))
+        ),
+        "HSI→LAB": lambda: _scalar_map(
+            cc.rgb_to_lab, _scalar_map(cc.hsi_to_rgb, _scalar_map(cc.rgb_to_hsi, rgb))
+        ),
+    }
+
+
+def vector_round_trips(rgb, lab):
+    """Те же круги векторными функциями"""
+    return {
+        "LCH→LAB": lambda: cc.lch_to_lab_array(cc.lab_to_lch_array(lab)),
+        "RGB→LAB": lambda: cc.rgb_to_lab_array(
+            cc.lab_to_rgb_array(lab, illuminant=SCALAR_LAB_TO_RGB_ILLUMINANT)
+        ),
+        "HSB→LAB": lambda: cc.rgb_to_lab_array(
+            cc.hsb_to_rgb_array(cc.rgb_to_hsb_array(rgb))
+        ),
+        "HSI→LAB": lambda: cc.rgb_to_lab_array(
+            cc.hsi_to_rgb_array(cc.rgb_to_hsi_array(rgb))
+        ),
+    }
+
+
+def delta_e_stats(reference, result):
+    """Статистика ΔE2000 между эталоном и результатом круга"""
+    delta_e = cc.delta_e_cie2000_array(reference, result)
+    return {
+        "mean": float(delta_e.mean()),
+        "median": float(np.median(delta_e)),
+        "p95": float(np.percentile(delta_e, 95)),
+        "p99": float(np.percentile(delta_e, 99)),
+        "max": float(delta_e.max()),
+    }
+
+
+def timed(func, repeat):
+    """Результат функции и лучшее время из repeat запусков, с"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def run_benchmark(step=5, scalar_samples=5000, repeat=3, seed=0):
+    rgb = srgb_grid(step)
+    lab = cc.rgb_to_lab_array(rgb)
+    rng = np.random.default_rng(seed)
+    subset = rng.choice(len(rgb), size=min(scalar_samples, len(rgb)), replace=False)
+    subset.sort()
+
+    # Скалярный путь медленный - один запуск на подвыборке
+    scalar = {
+        name: timed(trip, 1)
+        for name, trip in scalar_round_trips(rgb[subset], lab[subset]).items()
+    }
+    vector = {
+        name: timed(trip, repeat) for name, trip in vector_round_trips(rgb, lab).items()
+    }
+
+    print(f"Сетка sRGB с шагом {step}: {len(rgb)} цветов")
+    print(f"Скалярный путь: случайная подвыборка из {len(subset)} цветов")
+
+    print("\nТаблица 1: ΔE2000 после обратного пересчета")
+    print(
+        "| Круг     | Путь      | Среднее  | Медиана  | P95      | P99      | Макс     |"
+    )
+    print(
+        "|----------|-----------|----------|----------|----------|----------|----------|"
+    )
+    for name in vector:
+        for path, result, reference in (
+            ("скалярный", scalar[name][0], lab[subset]),
+            ("векторный", vector[name][0], lab),
+        ):
+            stats = delta_e_stats(reference, result)
+            print(
+                f"| {name:<8} | {path:<9} | {stats['mean']:<8.4f} | {stats['median']:<8.4f} "
+                f"| {stats['p95']:<8.4f} | {stats['p99']:<8.4f} | {stats['max']:<8.4f} |"
+            )
+
+    print("\nТаблица 2: Скорость, цветов в секунду")
+    print("| Круг     | Скалярный    | Векторный    | Ускорение | Расхождение |")
+    print("|----------|--------------|--------------|-----------|-------------|")
+    for name in vector:
+        scalar_result, scalar_time = scalar[name]
+        vector_result, vector_time = vector[name]
+        scalar_rate = len(subset) / scalar_time
+        vector_rate = len(rgb) / vector_time
+        # Расхождение путей на общей подвыборке, в единицах Lab
+        mismatch = np.abs(vector_result[subset] - scalar_result).max()
+        print(
+            f"| {name:<8} | {scalar_rate:<12.0f} | {vector_rate:<12.0f} "
+            f"| {vector_rate / scalar_rate:<9.0f} | {mismatch:<11.2e} |"
+        )
+    print("\nВремя векторного пути - лучшее из запусков")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Точность и скорость обратных преобразований цвета"
+    )
+    parser.add_argument("--step", type=int, default=5, help="Шаг сетки sRGB")
+    parser.add_argument(
+        "--scalar-samples",
+        type=int,
+        default=5000,
+        help="Цветов для скалярного пути",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run_benchmark(args.step, args.scalar_samples, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
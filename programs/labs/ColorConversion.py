@@ -1,4 +1,5 @@
 import math
+import numpy as np
 from colormath.color_objects import LabColor, sRGBColor
 from colormath.color_conversions import convert_color
 
@@ -153,6 +154,402 @@ def hsi_to_rgb(hsi_color):
     return (r, g, b)
 
 
+# Векторные версии преобразований для массивов формы (N, 3) или (H, W, 3).
+# Ветвления по секторам заменены на np.where / выбор по индексу сектора,
+# результат можно записать в заранее выделенный буфер out. Массив
+# обрабатывается блоками по CHUNK_SIZE цветов, чтобы временные массивы
+# помещались в кэш процессора.
+CHUNK_SIZE = 1 << 16
+
+
+def _color_array(colors):
+    """Массив цветов в плавающей точке (uint8 -> float32, float64 остается)"""
+    colors = np.asarray(colors)
+    if colors.shape[-1] != 3:
+        raise ValueError("Ожидается массив цветов формы (..., 3)")
+    return colors.astype(np.result_type(colors.dtype, np.float32), copy=False)
+
+
+def _output_buffer(out, colors):
+    if out is None:
+        dtype = np.result_type(colors.dtype, np.float32)
+        return np.empty(colors.shape, dtype=dtype)
+    if out.shape != colors.shape:
+        raise ValueError(f"Буфер out формы {out.shape}, ожидается {colors.shape}")
+    if not out.flags.c_contiguous:
+        raise ValueError("Буфер out должен быть непрерывным (C-порядок)")
+    return out
+
+
+def _chunks(colors, out):
+    """Пары блоков (исходные цвета, буфер результата) формы (n, 3)"""
+    source = colors.reshape(-1, 3)
+    target = out.reshape(-1, 3)
+    for start in range(0, len(source), CHUNK_SIZE):
+        stop = start + CHUNK_SIZE
+        yield source[start:stop], target[start:stop]
+
+
+def _vectorized(convert, accepts_uint8=False):
+    """Векторная версия преобразования блока (n, 3) -> (n, 3)
+
+    Блок результата записывается только после чтения исходного блока,
+    поэтому out может совпадать с исходным массивом. При accepts_uint8
+    8-битные массивы передаются в convert без приведения к float.
+    """
+
+    def wrapper(colors, out=None, **params):
+        colors = np.asarray(colors)
+        if not (accepts_uint8 and colors.dtype == np.uint8):
+            colors = _color_array(colors)
+        elif colors.shape[-1] != 3:
+            raise ValueError("Ожидается массив цветов формы (..., 3)")
+        out = _output_buffer(out, colors)
+        for source, target in _chunks(colors, out):
+            convert(source, target, **params)
+        return out
+
+    wrapper.__name__ = convert.__name__.lstrip("_") + "_array"
+    wrapper.__doc__ = convert.__doc__
+    return wrapper
+
+
+# Взятие по модулю и целая часть от деления для float в NumPy заметно
+# медленнее умножения, поэтому сектора считаются через np.floor
+
+
+def _floor_mod(x, period):
+    """x % period (как в Python) через np.floor"""
+    return x - period * np.floor(x / period)
+
+
+def _hue(r, g, b, cmax, delta):
+    """Тон в градусах по сектору максимальной компоненты (как в rgb_to_hsb)"""
+    # Сектор R: (g - b)/Δ, сектор G: (b - r)/Δ + 2, иначе (r - g)/Δ + 4
+    is_r = cmax == r
+    is_g = ~is_r & (cmax == g)
+    h = np.where(is_r, g - b, np.where(is_g, b - r, r - g))
+    np.divide(h, delta, out=h, where=delta != 0)
+
+    # Скаляры типа массива, чтобы float32 не повышался до float64
+    scalar = h.dtype.type
+    h += np.where(is_r, scalar(0), np.where(is_g, scalar(2), scalar(4)))
+    h *= 60
+    # Отрицательный угол в секторе R - это взятие по модулю 6 в rgb_to_hsb
+    np.add(h, 360, out=h, where=h < 0)
+    np.copyto(h, 0, where=delta == 0)
+    return h
+
+
+def _max_min(rgb):
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    return r, g, b, np.maximum(np.maximum(r, g), b), np.minimum(np.minimum(r, g), b)
+
+
+def _rgb_to_hsb(rgb, out):
+    """Преобразование массива RGB (0-255) в HSB (HSV)"""
+    r, g, b, cmax, cmin = _max_min(rgb)
+    delta = cmax - cmin
+
+    # Все промежуточные значения считаются до записи в out
+    h = _hue(r, g, b, cmax, delta)
+    s = np.divide(delta, cmax, out=np.zeros_like(delta), where=cmax != 0)
+
+    out[:, 0] = h
+    out[:, 1] = s
+    np.divide(cmax, 255.0, out=out[:, 2])
+
+
+# (R, G, B) в секторах 0..5: (c,x,0) (x,c,0) (0,c,x) (0,x,c) (x,0,c) (c,0,x);
+# строки - каналы, столбцы - сектора
+_HSB_C = np.array(
+    [[1, 0, 0, 0, 0, 1], [0, 1, 1, 0, 0, 0], [0, 0, 0, 1, 1, 0]], dtype=np.float32
+)
+_HSB_X = np.array(
+    [[0, 1, 0, 0, 1, 0], [1, 0, 0, 1, 0, 0], [0, 0, 1, 0, 0, 1]], dtype=np.float32
+)
+
+
+def _hsb_to_rgb(hsb, out):
+    """Преобразование массива HSB (HSV) в RGB (0-255)"""
+    h, s, v = hsb[:, 0], hsb[:, 1], hsb[:, 2]
+
+    sector = np.floor(h / 60)
+    c = v * s
+    x = c * (1 - np.abs(_floor_mod(h / 60, 2) - 1))
+    m = v - c
+
+    # Углы вне [0, 360) попадают в последний сектор, как в hsb_to_rgb
+    sector[(h < 0) | (h >= 360)] = 5
+    sector = sector.astype(np.intp)
+
+    # Канал = c·[c в секторе] + x·[x в секторе] + m
+    for channel in range(3):
+        value = c * _HSB_C[channel].take(sector)
+        value += x * _HSB_X[channel].take(sector)
+        value += m
+        np.multiply(value, 255, out=out[:, channel])
+
+
+def _rgb_to_hsi(rgb, out):
+    """Преобразование массива RGB (0-255) в HSI"""
+    r, g, b, cmax, cmin = _max_min(rgb)
+
+    # Вычисление Hue (аналогично HSV)
+    h = _hue(r, g, b, cmax, cmax - cmin)
+
+    # Вычисление Intensity и Saturation (отношение cmin/i от масштаба не зависит)
+    i = (r + g + b) / 3
+    s = np.divide(cmin, i, out=np.ones_like(i), where=i > 0)
+    np.subtract(1, s, out=s)
+
+    out[:, 0] = h
+    out[:, 1] = s
+    np.divide(i, 255.0, out=out[:, 2])
+
+
+# (R, G, B) в секторах HSI: (high, rest, low), (low, high, rest), (rest, low, high);
+# строки - каналы, столбцы - сектора
+_HSI_LOW = np.array([[0, 1, 0], [0, 0, 1], [1, 0, 0]], dtype=np.float32)
+_HSI_HIGH = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float32)
+_HSI_REST = np.array([[0, 0, 1], [1, 0, 0], [0, 1, 0]], dtype=np.float32)
+
+
+def _hsi_to_rgb(hsi, out):
+    """Преобразование массива HSI в RGB (0-255)"""
+    h, s, i = hsi[:, 0], hsi[:, 1], hsi[:, 2]
+
+    # Сектор 0-120, 120-240 или 240-360 и угол внутри сектора
+    h = _floor_mod(h, 360)
+    sector = np.minimum(np.floor(h / 120), 2)
+    h_rad = np.radians(h - 120 * sector)
+    sector = sector.astype(np.intp)
+
+    low = i * (1 - s)
+    high = i * (1 + (s * np.cos(h_rad) / np.cos(math.radians(60) - h_rad)))
+    rest = 3 * i - (low + high)
+
+    # При нулевой насыщенности - серый без ограничения, как в hsi_to_rgb
+    gray = s == 0
+    for channel in range(3):
+        value = low * _HSI_LOW[channel].take(sector)
+        value += high * _HSI_HIGH[channel].take(sector)
+        value += rest * _HSI_REST[channel].take(sector)
+        np.clip(value, 0, 1, out=value)
+        value[gray] = i[gray]
+        np.multiply(value, 255, out=out[:, channel])
+
+
+def _lab_to_lch(lab, out):
+    """Преобразование массива LAB в LCH"""
+    l, a, b = lab[:, 0], lab[:, 1], lab[:, 2]
+
+    c = np.hypot(a, b)
+    h = np.degrees(np.arctan2(b, a))
+    h[h < 0] += 360
+
+    out[:, 0] = l
+    out[:, 1] = c
+    out[:, 2] = h
+
+
+def _lch_to_lab(lch, out):
+    """Преобразование массива LCH в LAB"""
+    l, c, h = lch[:, 0], lch[:, 1], lch[:, 2]
+
+    h_rad = np.radians(h)
+    a = c * np.cos(h_rad)
+    b = c * np.sin(h_rad)
+
+    out[:, 0] = l
+    out[:, 1] = a
+    out[:, 2] = b
+
+
+rgb_to_hsb_array = _vectorized(_rgb_to_hsb)
+hsb_to_rgb_array = _vectorized(_hsb_to_rgb)
+rgb_to_hsi_array = _vectorized(_rgb_to_hsi)
+hsi_to_rgb_array = _vectorized(_hsi_to_rgb)
+lab_to_lch_array = _vectorized(_lab_to_lch)
+lch_to_lab_array = _vectorized(_lch_to_lab)
+
+
+# sRGB <-> XYZ <-> Lab на NumPy. Константы и формулы повторяют colormath
+# (color_objects.sRGBColor, color_conversions, chromatic_adaptation), чтобы
+# результаты совпадали с rgb_to_lab/lab_to_rgb без создания объектов на цвет.
+
+# Белые точки осветителей, наблюдатель 2°
+ILLUMINANTS = {
+    "a": (1.09850, 1.00000, 0.35585),
+    "b": (0.99072, 1.00000, 0.85223),
+    "c": (0.98074, 1.00000, 1.18232),
+    "d50": (0.96422, 1.00000, 0.82521),
+    "d55": (0.95682, 1.00000, 0.92149),
+    "d65": (0.95047, 1.00000, 1.08883),
+    "d75": (0.94972, 1.00000, 1.22638),
+    "e": (1.00000, 1.00000, 1.00000),
+    "f2": (0.99186, 1.00000, 0.67393),
+    "f7": (0.95041, 1.00000, 1.08747),
+    "f11": (1.00962, 1.00000, 0.64350),
+}
+
+# Родной осветитель sRGB и матрицы перехода линейного RGB <-> XYZ
+SRGB_ILLUMINANT = "d65"
+RGB_TO_XYZ = np.array(
+    [
+        [0.412424, 0.357579, 0.180464],
+        [0.212656, 0.715158, 0.0721856],
+        [0.0193324, 0.119193, 0.950444],
+    ]
+)
+XYZ_TO_RGB = np.array(
+    [
+        [3.24071, -1.53726, -0.498571],
+        [-0.969258, 1.87599, 0.0415557],
+        [0.0556352, -0.203996, 1.05707],
+    ]
+)
+
+# Матрица Брэдфорда для хроматической адаптации
+BRADFORD = np.array(
+    [
+        [0.8951, 0.2664, -0.1614],
+        [-0.7502, 1.7135, 0.0367],
+        [0.0389, -0.0685, 1.0296],
+    ]
+)
+
+CIE_E = 216.0 / 24389.0
+
+
+def srgb_to_linear(values):
+    """Снятие гамма-компрессии sRGB (значения 0-1)"""
+    values = np.asarray(values)
+    return np.where(
+        values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4
+    )
+
+
+def linear_to_srgb(values):
+    """Гамма-компрессия sRGB (значения 0-1)"""
+    values = np.asarray(values)
+    return np.where(
+        values <= 0.0031308,
+        values * 12.92,
+        1.055 * np.maximum(values, 0.0031308) ** (1 / 2.4) - 0.055,
+    )
+
+
+# Для 8-битного RGB линеаризация - выборка из таблицы на 256 значений
+SRGB_LINEAR_LUT = srgb_to_linear(np.arange(256) / 255.0)
+
+
+def adaptation_matrix(source, target):
+    """Матрица хроматической адаптации Брэдфорда между осветителями"""
+    if source == target:
+        return np.eye(3)
+    cone_source = BRADFORD @ np.array(ILLUMINANTS[source])
+    cone_target = BRADFORD @ np.array(ILLUMINANTS[target])
+    return np.linalg.pinv(BRADFORD) @ np.diag(cone_target / cone_source) @ BRADFORD
+
+
+def _check_illuminant(illuminant):
+    if illuminant not in ILLUMINANTS:
+        raise ValueError(f"Неизвестный осветитель: {illuminant}")
+
+
+def _rgb_to_lab(rgb, out, illuminant="d65"):
+    """Преобразование массива RGB (0-255, uint8 или float) в LAB"""
+    _check_illuminant(illuminant)
+    dtype = out.dtype
+    if rgb.dtype == np.uint8:
+        linear = SRGB_LINEAR_LUT.astype(dtype, copy=False).take(rgb)
+    else:
+        linear = srgb_to_linear(rgb / 255.0)
+
+    # Линейный RGB -> XYZ(D65) -> адаптация -> нормировка на белую точку
+    matrix = adaptation_matrix(SRGB_ILLUMINANT, illuminant) @ RGB_TO_XYZ
+    matrix /= np.array(ILLUMINANTS[illuminant])[:, None]
+    xyz = linear @ matrix.T.astype(dtype)
+
+    f = np.where(xyz > CIE_E, np.cbrt(xyz), 7.787 * xyz + 16.0 / 116.0)
+    fx, fy, fz = f[:, 0], f[:, 1], f[:, 2]
+    out[:, 0] = 116.0 * fy - 16.0
+    out[:, 1] = 500.0 * (fx - fy)
+    out[:, 2] = 200.0 * (fy - fz)
+
+
+def _lab_to_rgb(lab, out, illuminant="d65"):
+    """Преобразование массива LAB в RGB (0-255, сверху охват не ограничен)"""
+    _check_illuminant(illuminant)
+    l, a, b = lab[:, 0], lab[:, 1], lab[:, 2]
+
+    fy = (l + 16.0) / 116.0
+    f = np.stack([a / 500.0 + fy, fy, fy - b / 200.0], axis=-1)
+    cube = f**3
+    xyz = np.where(cube > CIE_E, cube, (f - 16.0 / 116.0) / 7.787)
+
+    # Белая точка -> XYZ -> адаптация к D65 -> линейный RGB
+    matrix = XYZ_TO_RGB @ adaptation_matrix(illuminant, SRGB_ILLUMINANT)
+    matrix = matrix * np.array(ILLUMINANTS[illuminant])[None, :]
+    linear = xyz @ matrix.T.astype(xyz.dtype)
+    # Как и colormath, отрицательные линейные значения обнуляются
+    np.maximum(linear, 0.0, out=linear)
+
+    np.multiply(linear_to_srgb(linear), 255.0, out=out)
+
+
+rgb_to_lab_array = _vectorized(_rgb_to_lab, accepts_uint8=True)
+lab_to_rgb_array = _vectorized(_lab_to_rgb)
+
+
+def verify_lab_pipeline(samples=2000, seed=0):
+    """Сверка векторного sRGB <-> Lab с colormath на случайных цветах
+
+    Возвращает максимальные отклонения: Lab (D65 и D50) от convert_color,
+    RGB из Lab от convert_color и RGB после круга RGB -> Lab -> RGB.
+    """
+    rng = np.random.default_rng(seed)
+    rgb = rng.integers(0, 256, size=(samples, 3)).astype(np.float64)
+    # Углы куба и серая ось - граничные случаи компандинга
+    corners = np.array(np.meshgrid([0, 255], [0, 255], [0, 255])).T.reshape(-1, 3)
+    gray = np.repeat(np.arange(0, 256, 5)[:, None], 3, axis=1)
+    rgb = np.vstack([rgb, corners, gray])
+
+    report = {}
+    for illuminant in ("d65", "d50"):
+        reference = np.array(
+            [
+                convert_color(
+                    sRGBColor(*(color / 255.0)),
+                    LabColor,
+                    target_illuminant=illuminant,
+                ).get_value_tuple()
+                for color in rgb
+            ]
+        )
+        lab = rgb_to_lab_array(rgb, illuminant=illuminant)
+        report[f"rgb_to_lab_{illuminant}"] = float(np.abs(lab - reference).max())
+
+        rgb_reference = np.array(
+            [
+                convert_color(
+                    LabColor(*color, illuminant=illuminant), sRGBColor
+                ).get_value_tuple()
+                for color in reference
+            ]
+        )
+        rgb_back = lab_to_rgb_array(reference, illuminant=illuminant)
+        report[f"lab_to_rgb_{illuminant}"] = float(
+            np.abs(rgb_back - rgb_reference * 255).max()
+        )
+
+    rgb_8bit = rgb.astype(np.uint8)
+    round_trip = lab_to_rgb_array(rgb_to_lab_array(rgb_8bit).astype(np.float64))
+    report["round_trip_rgb"] = float(np.abs(round_trip - rgb).max())
+    return report
+
+
 def _validate_lab_colors(color1, color2):
     """Проверка, что оба цвета являются LabColor объектами."""
     if (
@@ -328,6 +725,207 @@ def delta_e_cmc(color1, color2, pl=2, pc=1):
     return math.sqrt(term1**2 + term2**2 + term3**2)
 
 
+# Векторные версии ΔE повторяют скалярные формулы выше, но работают с
+# массивами Lab формы (..., 3) с broadcasting: (N, 3) против (N, 3) или (3,),
+# изображение (H, W, 3) против изображения или одного цвета. Расчет идет
+# полосами по первой оси результата, чтобы промежуточные массивы формулы
+# CIEDE2000 не занимали память, кратную размеру всего изображения.
+
+
+def _lab_channels(lab):
+    return lab[..., 0], lab[..., 1], lab[..., 2]
+
+
+def _delta_e_vectorized(formula):
+    """Векторная версия ΔE с broadcasting и расчетом по полосам"""
+
+    def wrapper(lab1, lab2, out=None, **params):
+        lab1 = _color_array(lab1)
+        lab2 = _color_array(lab2)
+        shape = np.broadcast_shapes(lab1.shape, lab2.shape)
+        lab1 = np.broadcast_to(lab1, shape)
+        lab2 = np.broadcast_to(lab2, shape)
+
+        result_shape = shape[:-1]
+        if out is None:
+            dtype = np.result_type(lab1.dtype, lab2.dtype)
+            out = np.empty(result_shape, dtype=dtype)
+        elif out.shape != result_shape:
+            raise ValueError(f"Буфер out формы {out.shape}, ожидается {result_shape}")
+        if not result_shape:
+            out[...] = formula(*_lab_channels(lab1), *_lab_channels(lab2), **params)
+            return out
+
+        # Число строк первой оси на полосу - около CHUNK_SIZE цветов
+        row_size = math.prod(result_shape[1:])
+        step = max(1, CHUNK_SIZE // max(row_size, 1))
+        for start in range(0, result_shape[0], step):
+            rows = slice(start, start + step)
+            out[rows] = formula(
+                *_lab_channels(lab1[rows]), *_lab_channels(lab2[rows]), **params
+            )
+        return out
+
+    wrapper.__name__ = formula.__name__.lstrip("_") + "_array"
+    wrapper.__doc__ = formula.__doc__
+    return wrapper
+
+
+def _delta_e_cie1976(L1, a1, b1, L2, a2, b2):
+    """ΔE (CIE1976) между массивами Lab"""
+    return np.sqrt((L1 - L2) ** 2 + (a1 - a2) ** 2 + (b1 - b2) ** 2)
+
+
+def _delta_e_cie1994(L1, a1, b1, L2, a2, b2, K_L=1, K_C=1, K_H=1, K_1=0.045, K_2=0.015):
+    """ΔE (CIE1994) между массивами Lab, первый цвет - эталон"""
+    delta_L = L1 - L2
+    delta_a = a1 - a2
+    delta_b = b1 - b2
+
+    C1 = np.hypot(a1, b1)
+    C2 = np.hypot(a2, b2)
+    delta_C = C1 - C2
+
+    delta_H_squared = delta_a**2 + delta_b**2 - delta_C**2
+    delta_H = np.sqrt(np.maximum(delta_H_squared, 0))
+
+    S_L = 1
+    S_C = 1 + K_1 * C1
+    S_H = 1 + K_2 * C1
+
+    term1 = delta_L / (K_L * S_L)
+    term2 = delta_C / (K_C * S_C)
+    term3 = delta_H / (K_H * S_H)
+
+    return np.sqrt(term1**2 + term2**2 + term3**2)
+
+
+def _delta_e_cie2000(L1, a1, b1, L2, a2, b2, Kl=1, Kc=1, Kh=1):
+    """ΔE (CIE2000) между массивами Lab"""
+    L_bar_prime = (L1 + L2) / 2
+
+    C1 = np.hypot(a1, b1)
+    C2 = np.hypot(a2, b2)
+    C_bar = (C1 + C2) / 2
+
+    C_bar7 = C_bar**7
+    G = 0.5 * (1 - np.sqrt(C_bar7 / (C_bar7 + 25**7)))
+    a1_prime = a1 * (1 + G)
+    a2_prime = a2 * (1 + G)
+
+    C1_prime = np.hypot(a1_prime, b1)
+    C2_prime = np.hypot(a2_prime, b2)
+    C_bar_prime = (C1_prime + C2_prime) / 2
+
+    h1_prime = _floor_mod(np.degrees(np.arctan2(b1, a1_prime)), 360)
+    h2_prime = _floor_mod(np.degrees(np.arctan2(b2, a2_prime)), 360)
+
+    h_sum = h1_prime + h2_prime
+    h_diff = h2_prime - h1_prime
+    far = np.abs(h_diff) > 180
+    h_bar_prime = np.where(far, np.where(h_sum < 360, h_sum + 360, h_sum - 360), h_sum)
+    h_bar_prime /= 2
+
+    h_bar_rad = np.radians(h_bar_prime)
+    T = (
+        1
+        - 0.17 * np.cos(h_bar_rad - math.radians(30))
+        + 0.24 * np.cos(2 * h_bar_rad)
+        + 0.32 * np.cos(3 * h_bar_rad + math.radians(6))
+        - 0.20 * np.cos(4 * h_bar_rad - math.radians(63))
+    )
+
+    delta_h_prime = np.where(
+        far, np.where(h2_prime <= h1_prime, h_diff + 360, h_diff - 360), h_diff
+    )
+
+    delta_L_prime = L2 - L1
+    delta_C_prime = C2_prime - C1_prime
+    delta_H_prime = (
+        2 * np.sqrt(C1_prime * C2_prime) * np.sin(np.radians(delta_h_prime / 2))
+    )
+
+    L_shift = (L_bar_prime - 50) ** 2
+    S_L = 1 + (0.015 * L_shift) / np.sqrt(20 + L_shift)
+    S_C = 1 + 0.045 * C_bar_prime
+    S_H = 1 + 0.015 * C_bar_prime * T
+
+    delta_theta = 30 * np.exp(-(((h_bar_prime - 275) / 25) ** 2))
+    C_bar_prime7 = C_bar_prime**7
+    R_C = 2 * np.sqrt(C_bar_prime7 / (C_bar_prime7 + 25**7))
+    R_T = -R_C * np.sin(np.radians(2 * delta_theta))
+
+    term1 = delta_L_prime / (Kl * S_L)
+    term2 = delta_C_prime / (Kc * S_C)
+    term3 = delta_H_prime / (Kh * S_H)
+    term4 = R_T * term2 * term3
+
+    return np.sqrt(term1**2 + term2**2 + term3**2 + term4)
+
+
+def _delta_e_cmc(L1, a1, b1, L2, a2, b2, pl=2, pc=1):
+    """ΔE (CMC l:c) между массивами Lab, первый цвет - эталон"""
+    C1 = np.hypot(a1, b1)
+    C2 = np.hypot(a2, b2)
+
+    delta_L = L2 - L1
+    delta_C = C2 - C1
+    delta_a = a2 - a1
+    delta_b = b2 - b1
+
+    delta_H_squared = delta_a**2 + delta_b**2 - delta_C**2
+    delta_H = np.sqrt(np.maximum(0, delta_H_squared))
+
+    S_L = np.where(L1 >= 16, 0.040975 * L1 / (1 + 0.01765 * L1), 0.511)
+    S_C = 0.0638 * C1 / (1 + 0.0131 * C1) + 0.638
+    C1_4 = C1**4
+    F = np.sqrt(C1_4 / (C1_4 + 1900))
+
+    h1 = np.degrees(np.arctan2(b1, a1))
+    h1_wrapped = _floor_mod(h1, 360)
+    T = np.where(
+        (164 <= h1_wrapped) & (h1_wrapped <= 345),
+        0.56 + np.abs(0.2 * np.cos(np.radians(168 + h1))),
+        0.36 + np.abs(0.4 * np.cos(np.radians(35 + h1))),
+    )
+
+    S_H = S_C * (F * T + 1 - F)
+
+    term1 = delta_L / (pl * S_L)
+    term2 = delta_C / (pc * S_C)
+    term3 = delta_H / S_H
+
+    return np.sqrt(term1**2 + term2**2 + term3**2)
+
+
+delta_e_cie1976_array = _delta_e_vectorized(_delta_e_cie1976)
+delta_e_cie1994_array = _delta_e_vectorized(_delta_e_cie1994)
+delta_e_cie2000_array = _delta_e_vectorized(_delta_e_cie2000)
+delta_e_cmc_array = _delta_e_vectorized(_delta_e_cmc)
+
+DELTA_E_METHODS = {
+    "cie1976": delta_e_cie1976_array,
+    "cie1994": delta_e_cie1994_array,
+    "cie2000": delta_e_cie2000_array,
+    "cmc": delta_e_cmc_array,
+}
+
+
+def delta_e_pairwise(colors, palette, method="cie2000", out=None, **params):
+    """Матрица ΔE (N, M) между каждым цветом colors и каждым цветом palette
+
+    Цвета colors передаются первым аргументом формулы (эталон для CIE1994
+    и CMC). Память на промежуточные массивы ограничена полосами строк.
+    """
+    if method not in DELTA_E_METHODS:
+        raise ValueError(f"Неизвестный метод ΔE: {method}")
+    colors = _color_array(colors).reshape(-1, 3)
+    palette = _color_array(palette).reshape(-1, 3)
+    return DELTA_E_METHODS[method](
+        colors[:, None, :], palette[None, :, :], out=out, **params
+    )
+
+
 def main():
     # 1. Задаем исходный цвет в LAB
     print(f"Исходный цвет LAB: {original_lab}")
@@ -420,6 +1018,13 @@ def main():
         f"| ΔE (2000)  | {de_lch_00:<8.2f} | {de_rgb_00:<8.2f} | {de_hsb_00:<8.2f} | {de_hsi_00:<8.2f} |"
     )
 
+    # 8. Сверка векторного sRGB <-> Lab с colormath
+    print("\nТаблица 6: Максимальное отклонение NumPy-версии от colormath")
+    print("| Проверка            | Отклонение |")
+    print("|---------------------|------------|")
+    for name, error in verify_lab_pipeline().items():
+        print(f"| {name:<19} | {error:<10.2e} |")
+
 
 if __name__ == "__main__":
     main()
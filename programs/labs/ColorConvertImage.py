@@ -0,0 +1,229 @@
+"""Перевод файлов изображений в Lab, LCH, HSB или HSI и карта ΔE
+
+Изображение обрабатывается полосами строк в пуле потоков векторными
+функциями ColorConversion (NumPy отпускает GIL на вычислениях). Результат -
+float32 каналы в .npy или TIFF. Исходное изображение хранится в своей
+глубине (uint8, uint16 или float32) и переводится в RGB 0-255 по полосам.
+Для .npy и, при установленном tifffile, для TIFF выходной массив открыт
+через memmap и заполняется по полосам, поэтому в памяти кроме исходного
+изображения находятся только временные массивы обрабатываемых полос. Без
+tifffile TIFF собирается в памяти целиком для cv2.imwrite.
+
+В TIFF каналы записаны в порядке пространства (L, a, b и т.д.). OpenCV при
+чтении такого файла вернет их в обратном порядке, как BGR.
+
+Примеры:
+    python ColorConvertImage.py photo.png photo_lab.npy --space lab
+    python ColorConvertImage.py photo.png photo_hsi.tif --space hsi -w 4
+    python ColorConvertImage.py proof.png delta.npy --delta-e reference.png
+"""
+
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+import ColorConversion as cc
+
+try:
+    import tifffile
+except ImportError:
+    tifffile = None
+
+SPACES = ("lab", "lch", "hsb", "hsi")
+OUTPUT_EXTENSIONS = (".npy", ".tif", ".tiff")
+DEFAULT_STRIP_ROWS = 256
+
+
+def read_image(path):
+    """Изображение в родной глубине и порядке каналов OpenCV (серое, BGR, BGRA)"""
+    image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+    if image is None:
+        raise ValueError(f"Не удалось прочитать изображение: {path}")
+    return image
+
+
+def rgb_strip(image, y0, y1):
+    """Полоса строк в RGB: uint8 для 8 бит, float32 в шкале 0-255 для 16 бит"""
+    strip = image[y0:y1]
+    if strip.ndim == 2:
+        strip = np.repeat(strip[..., None], 3, axis=-1)
+    else:
+        # BGR(A) -> RGB без альфа-канала
+        strip = strip[..., 2::-1]
+    if strip.dtype == np.uint8:
+        return strip
+    if strip.dtype == np.uint16:
+        return strip.astype(np.float32) * np.float32(255 / 65535)
+    # Изображения с плавающей точкой считаются заданными в шкале 0-1
+    return strip.astype(np.float32) * np.float32(255)
+
+
+def _check_output(path):
+    if os.path.splitext(path)[1].lower() not in OUTPUT_EXTENSIONS:
+        raise ValueError(f"Поддерживаются только {', '.join(OUTPUT_EXTENSIONS)}")
+
+
+def open_output(path, shape):
+    """Выходной float32 массив: memmap для .npy и TIFF, без tifffile - массив
+
+    Массив для cv2.imwrite хранит три канала в обратном порядке (как BGR),
+    чтобы записать его без копии; полосы в него пишет write_strip.
+    """
+    _check_output(path)
+    if path.lower().endswith(".npy"):
+        return np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=shape)
+    if tifffile is not None:
+        return tifffile.memmap(path, shape=shape, dtype=np.float32)
+    return np.empty(shape, dtype=np.float32)
+
+
+def _reversed_channels(out):
+    return not isinstance(out, np.memmap) and out.ndim == 3
+
+
+def write_strip(out, y0, y1, fill):
+    """Заполнение строк y0:y1 выходного массива функцией fill(target)"""
+    if not _reversed_channels(out):
+        fill(out[y0:y1])
+        return
+    strip = np.empty(out[y0:y1].shape, dtype=out.dtype)
+    fill(strip)
+    out[y0:y1] = strip[..., ::-1]
+
+
+def save_output(path, out):
+    """Запись результата; возвращает его с каналами в порядке пространства"""
+    if isinstance(out, np.memmap):
+        out.flush()
+        return out
+    if not cv2.imwrite(path, out):
+        raise ValueError(f"Не удалось записать файл: {path}")
+    return out[..., ::-1] if _reversed_channels(out) else out
+
+
+def process_strips(height, func, strip_rows=DEFAULT_STRIP_ROWS, workers=None):
+    """Вызов func(y0, y1) для полос строк в пуле потоков"""
+    strips = [(y0, min(y0 + strip_rows, height)) for y0 in range(0, height, strip_rows)]
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        list(pool.map(lambda strip: func(*strip), strips))
+
+
+def _convert_strip(rgb, out, space, illuminant):
+    if space in ("lab", "lch"):
+        cc.rgb_to_lab_array(rgb, out=out, illuminant=illuminant)
+        if space == "lch":
+            cc.lab_to_lch_array(out, out=out)
+    elif space == "hsb":
+        cc.rgb_to_hsb_array(rgb, out=out)
+    else:
+        cc.rgb_to_hsi_array(rgb, out=out)
+
+
+def convert_image(
+    input_path,
+    output_path,
+    space="lab",
+    strip_rows=DEFAULT_STRIP_ROWS,
+    workers=None,
+    illuminant="d65",
+):
+    """Перевод файла изображения в пространство space с записью в output_path"""
+    if space not in SPACES:
+        raise ValueError(f"Неизвестное пространство: {space}")
+    image = read_image(input_path)
+    out = open_output(output_path, image.shape[:2] + (3,))
+
+    def convert(y0, y1):
+        rgb = rgb_strip(image, y0, y1)
+        write_strip(
+            out, y0, y1, lambda target: _convert_strip(rgb, target, space, illuminant)
+        )
+
+    process_strips(image.shape[0], convert, strip_rows, workers)
+    return save_output(output_path, out)
+
+
+def delta_e_map(
+    input_path,
+    reference_path,
+    output_path,
+    metric="cie2000",
+    strip_rows=DEFAULT_STRIP_ROWS,
+    workers=None,
+):
+    """Карта ΔE (H, W) между двумя изображениями одного размера"""
+    if metric not in cc.DELTA_E_METHODS:
+        raise ValueError(f"Неизвестный метод ΔE: {metric}")
+    image = read_image(input_path)
+    reference = read_image(reference_path)
+    if image.shape[:2] != reference.shape[:2]:
+        raise ValueError(
+            f"Размеры изображений не совпадают: {image.shape[:2]} и "
+            f"{reference.shape[:2]}"
+        )
+    out = open_output(output_path, image.shape[:2])
+    delta_e = cc.DELTA_E_METHODS[metric]
+
+    def compare(y0, y1):
+        lab = cc.rgb_to_lab_array(rgb_strip(image, y0, y1))
+        reference_lab = cc.rgb_to_lab_array(rgb_strip(reference, y0, y1))
+        delta_e(reference_lab, lab, out=out[y0:y1])
+
+    process_strips(image.shape[0], compare, strip_rows, workers)
+    return save_output(output_path, out)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Перевод изображений в Lab/LCH/HSB/HSI и карта ΔE"
+    )
+    parser.add_argument("input", help="Исходное изображение")
+    parser.add_argument("output", help="Результат (.npy, .tif, .tiff)")
+    parser.add_argument("--space", choices=SPACES, default="lab")
+    parser.add_argument(
+        "--illuminant",
+        choices=sorted(cc.ILLUMINANTS),
+        default="d65",
+        help="Белая точка для Lab и LCH",
+    )
+    parser.add_argument(
+        "--delta-e",
+        metavar="REFERENCE",
+        help="Вместо перевода - карта ΔE относительно эталонного изображения",
+    )
+    parser.add_argument(
+        "--metric", choices=sorted(cc.DELTA_E_METHODS), default="cie2000"
+    )
+    parser.add_argument("--strip-rows", type=int, default=DEFAULT_STRIP_ROWS)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.delta_e:
+        result = delta_e_map(
+            args.input,
+            args.delta_e,
+            args.output,
+            args.metric,
+            args.strip_rows,
+            args.workers,
+        )
+        print(
+            f"ΔE ({args.metric}): среднее {result.mean():.3f}, "
+            f"P95 {np.percentile(result, 95):.3f}, макс {result.max():.3f}"
+        )
+    else:
+        convert_image(
+            args.input,
+            args.output,
+            args.space,
+            args.strip_rows,
+            args.workers,
+            args.illuminant,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""3D-таблицы (LUT) для преобразования 8-битного RGB в Lab, HSB и HSI
+
+У 8-битного RGB всего 256^3 = 16.7 млн цветов, поэтому преобразование можно
+один раз посчитать в узлах сетки и сохранить на диск. Таблица полного
+разрешения (256 узлов на ось) дает точное значение выборкой по индексу,
+уменьшенная (например, 33 или 65 узлов) - трилинейной или тетраэдральной
+интерполяцией между узлами. Таблица строится лениво при первом обращении и
+открывается с диска через memmap, так что в память попадают только
+прочитанные страницы.
+
+Тон (HSB, HSI) хранится как пара cos/sin: линейная интерполяция угла дала бы
+неверный результат на переходе 360 -> 0.
+
+Пример:
+    lut = get_lut("lab", size=33, interpolation="tetrahedral")
+    lab = lut.apply(rgb_image)
+    print(lut.validate())
+"""
+
+import functools
+import os
+
+import numpy as np
+
+import ColorConversion as cc
+
+# Точные векторные преобразования и обратные к ним (для проверки по ΔE)
+CONVERSIONS = {
+    "lab": cc.rgb_to_lab_array,
+    "hsb": cc.rgb_to_hsb_array,
+    "hsi": cc.rgb_to_hsi_array,
+}
+INVERSE_CONVERSIONS = {
+    "lab": cc.lab_to_rgb_array,
+    "hsb": cc.hsb_to_rgb_array,
+    "hsi": cc.hsi_to_rgb_array,
+}
+# Пространства, у которых первый канал - тон в градусах
+HUE_SPACES = {"hsb", "hsi"}
+
+INTERPOLATIONS = ("trilinear", "tetrahedral")
+FULL_SIZE = 256
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "lut_cache"
+)
+
+# Вершины единичного куба в порядке (dr, dg, db)
+_CUBE_CORNERS = [(i, j, k) for i in (0, 1) for j in (0, 1) for k in (0, 1)]
+
+
+class ColorLUT:
+    def __init__(
+        self, space, size=FULL_SIZE, interpolation="trilinear", cache_dir=None
+    ):
+        if space not in CONVERSIONS:
+            raise ValueError(f"Неизвестное пространство: {space}")
+        if not 2 <= size <= FULL_SIZE:
+            raise ValueError(f"Размер LUT должен быть от 2 до {FULL_SIZE}")
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(f"Неизвестная интерполяция: {interpolation}")
+        self.space = space
+        self.size = size
+        self.interpolation = interpolation
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.channels = 4 if space in HUE_SPACES else 3
+        self._table = None
+
+    @property
+    def path(self):
+        return os.path.join(self.cache_dir, f"rgb_to_{self.space}_{self.size}.npy")
+
+    @property
+    def table(self):
+        """Таблица (size^3, channels) float32; строится при первом обращении"""
+        if self._table is None:
+            if not os.path.exists(self.path):
+                self.build()
+            # Уменьшенная таблица занимает сотни килобайт - читается целиком
+            mmap_mode = "r" if self.size == FULL_SIZE else None
+            self._table = np.load(self.path, mmap_mode=mmap_mode)
+        return self._table
+
+    def nodes(self):
+        """Значения RGB в узлах сетки по одной оси"""
+        return np.linspace(0, 255, self.size)
+
+    def build(self):
+        """Расчет таблицы точным преобразованием и запись на диск"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        nodes = self.nodes()
+        count = self.size**3
+        # Запись во временный файл: прерванная сборка не оставит битый кэш
+        tmp_path = self.path + ".tmp"
+        table = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=np.float32, shape=(count, self.channels)
+        )
+        convert = CONVERSIONS[self.space]
+        # Узел с индексом n соответствует (r, g, b) = divmod по основанию size
+        for start in range(0, count, cc.CHUNK_SIZE):
+            index = np.arange(start, min(start + cc.CHUNK_SIZE, count))
+            rgb = np.stack(
+                [
+                    nodes[index // (self.size * self.size)],
+                    nodes[index // self.size % self.size],
+                    nodes[index % self.size],
+                ],
+                axis=-1,
+            )
+            table[start : start + len(index)] = self._encode(convert(rgb))
+        table.flush()
+        del table
+        os.replace(tmp_path, self.path)
+        self._table = None
+
+    def _encode(self, values):
+        if self.space not in HUE_SPACES:
+            return values
+        h_rad = np.radians(values[:, 0])
+        return np.column_stack([np.cos(h_rad), np.sin(h_rad), values[:, 1:]])
+
+    def _decode(self, values, out):
+        if self.space not in HUE_SPACES:
+            out[:] = values
+            return
+        h = np.degrees(np.arctan2(values[:, 1], values[:, 0]))
+        out[:, 0] = cc._floor_mod(h, 360)
+        out[:, 1:] = values[:, 2:]
+
+    def apply(self, rgb, out=None):
+        """Преобразование массива uint8 (..., 3) выборкой из таблицы"""
+        rgb = np.asarray(rgb)
+        if rgb.dtype != np.uint8 or rgb.shape[-1] != 3:
+            raise ValueError("Ожидается массив uint8 формы (..., 3)")
+        out = cc._output_buffer(out, rgb)
+        if self.size == FULL_SIZE:
+            lookup = self._lookup
+        elif self.interpolation == "trilinear":
+            lookup = self._trilinear
+        else:
+            lookup = self._tetrahedral
+        for source, target in cc._chunks(rgb, out):
+            self._decode(lookup(source), target)
+        return out
+
+    @functools.cached_property
+    def _axes(self):
+        """Смещения нижних узлов в плоской таблице и доли по 256 уровням"""
+        position = np.arange(FULL_SIZE) * ((self.size - 1) / 255)
+        base = np.minimum(position.astype(np.intp), self.size - 2)
+        strides = self.size ** np.arange(2, -1, -1)
+        offsets = base[None, :] * strides[:, None]
+        return offsets, (position - base).astype(np.float32), strides
+
+    def _cell(self, rgb):
+        """Плоский индекс нижнего узла ячейки и доли внутри нее по R, G, B"""
+        offsets, fraction, _ = self._axes
+        channels = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+        base = sum(offset.take(c) for offset, c in zip(offsets, channels))
+        return base, [fraction.take(c) for c in channels]
+
+    def _lookup(self, rgb):
+        index = rgb.astype(np.intp)
+        flat = (index[:, 0] * FULL_SIZE + index[:, 1]) * FULL_SIZE + index[:, 2]
+        return self.table.take(flat, axis=0)
+
+    def _trilinear(self, rgb):
+        table = self.table
+        base, (fr, fg, fb) = self._cell(rgb)
+        _, _, strides = self._axes
+        weights = [(1 - fr, fr), (1 - fg, fg), (1 - fb, fb)]
+        result = np.zeros((len(rgb), self.channels), dtype=np.float32)
+        for i, j, k in _CUBE_CORNERS:
+            weight = weights[0][i] * weights[1][j] * weights[2][k]
+            corner = table.take(base + (i * strides[0] + j * strides[1] + k), axis=0)
+            result += weight[:, None] * corner
+        return result
+
+    def _tetrahedral(self, rgb):
+        # Тетраэдр ячейки задается порядком долей: путь от вершины (0,0,0)
+        # к (1,1,1) идет сначала вдоль оси с наибольшей долей, затем со
+        # средней. Вторая вершина - это (1,1,1) без оси с наименьшей долей.
+        table = self.table
+        base, (fr, fg, fb) = self._cell(rgb)
+        _, _, (sr, sg, sb) = self._axes
+        f_max = np.maximum(np.maximum(fr, fg), fb)
+        f_min = np.minimum(np.minimum(fr, fg), fb)
+        f_mid = fr + fg + fb - f_max - f_min
+        # При равных долях оси с наибольшей и наименьшей долей различны,
+        # если только все три доли не совпадают (тогда средние веса нулевые)
+        max_stride = np.where(fr == f_max, sr, np.where(fg == f_max, sg, sb))
+        min_stride = np.where(fb == f_min, sb, np.where(fg == f_min, sg, sr))
+        far = sr + sg + sb
+
+        vertices = (
+            (base, 1 - f_max),
+            (base + max_stride, f_max - f_mid),
+            (base + (far - min_stride), f_mid - f_min),
+            (base + far, f_min),
+        )
+        result = np.zeros((len(rgb), self.channels), dtype=np.float32)
+        for index, weight in vertices:
+            result += weight[:, None] * table.take(index, axis=0)
+        return result
+
+    def validate(self, samples=200_000, seed=0):
+        """Статистика ΔE2000 между выборкой из таблицы и точным расчетом
+
+        Для HSB и HSI оба результата переводятся обратно в RGB и затем в Lab.
+        """
+        rng = np.random.default_rng(seed)
+        rgb = rng.integers(0, 256, size=(samples, 3), dtype=np.uint8)
+        approx = self.apply(rgb).astype(np.float64)
+        exact = CONVERSIONS[self.space](rgb.astype(np.float64))
+        if self.space != "lab":
+            inverse = INVERSE_CONVERSIONS[self.space]
+            approx = cc.rgb_to_lab_array(inverse(approx))
+            exact = cc.rgb_to_lab_array(inverse(exact))
+        delta_e = cc.delta_e_cie2000_array(exact, approx)
+        return {
+            "mean": float(delta_e.mean()),
+            "p99": float(np.percentile(delta_e, 99)),
+            "max": float(delta_e.max()),
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def get_lut(space, size=FULL_SIZE, interpolation="trilinear", cache_dir=None):
+    """Общий экземпляр LUT для набора параметров (таблица строится лениво)"""
+    return ColorLUT(space, size, interpolation, cache_dir)
+
+
+def convert_image(rgb, space, size=FULL_SIZE, interpolation="trilinear"):
+    """Преобразование 8-битного изображения через LUT, остальное - точно"""
+    rgb = np.asarray(rgb)
+    if rgb.dtype != np.uint8:
+        return CONVERSIONS[space](rgb)
+    return get_lut(space, size, interpolation).apply(rgb)
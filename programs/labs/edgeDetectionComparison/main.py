@@ -1,10 +1,18 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import cv2
-import numpy as np
 from PIL import Image, ImageTk
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import os
 
+from metrics import COLUMNS, MetricsCache, compute_metrics
+from tiled_executor import TiledExecutor
+
+
+class TaskCancelled(Exception):
+    """Задача была отменена более новым запросом"""
+
 
 class EdgeDetectionApp:
     def __init__(self, root):
@@ -16,10 +24,32 @@ class EdgeDetectionApp:
         self.original_image = None
         self.processed_image = None
         self.current_operator = tk.StringVar(value="sobel")
+        self.reference_operator = tk.StringVar(value="canny")
+
+        # Фоновый обработчик операторов (один поток, чтобы не мешать Tk)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.current_task = None
+        self.cancel_event = None
+
+        # Большие изображения обрабатываются по плиткам в нескольких потоках
+        self.tiled_executor = TiledExecutor()
+
+        # Кэш результатов операторов и уменьшенных копий для отображения
+        self.operator_cache = {}
+        self.display_cache = {}
+
+        # Метрики по операторам и текущая сортировка таблицы
+        self.metrics_cache = MetricsCache(self.reference_operator.get())
+        self.sort_key = None
+        self.sort_reverse = False
 
         self.create_menu()
         self.create_main_layout()
 
+        self.current_operator.trace_add("write", self.on_operator_change)
+        self.reference_operator.trace_add("write", self.on_reference_change)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
     def create_menu(self):
         menubar = tk.Menu(self.root)
 
@@ -27,8 +57,11 @@ class EdgeDetectionApp:
         file_menu = tk.Menu(menubar, tearoff=0)
         file_menu.add_command(label="Открыть изображение", command=self.load_image)
         file_menu.add_command(label="Сохранить результат", command=self.save_result)
+        file_menu.add_command(
+            label="Экспорт результатов (CSV)", command=self.export_results
+        )
         file_menu.add_separator()
-        file_menu.add_command(label="Выход", command=self.root.quit)
+        file_menu.add_command(label="Выход", command=self.on_close)
         menubar.add_cascade(label="Файл", menu=file_menu)
 
         # Меню "Операторы"
@@ -50,6 +83,20 @@ class EdgeDetectionApp:
         )
         menubar.add_cascade(label="Операторы", menu=operators_menu)
 
+        # Меню "Эталон" - оператор для расчета IoU/F1
+        reference_menu = tk.Menu(menubar, tearoff=0)
+        for label, value in [
+            ("Робертса", "roberts"),
+            ("Превитта", "prewitt"),
+            ("Собела", "sobel"),
+            ("Лапласиан Гауссиана", "log"),
+            ("Канни", "canny"),
+        ]:
+            reference_menu.add_radiobutton(
+                label=label, variable=self.reference_operator, value=value
+            )
+        menubar.add_cascade(label="Эталон", menu=reference_menu)
+
         self.root.config(menu=menubar)
 
     def create_main_layout(self):
@@ -87,10 +134,17 @@ class EdgeDetectionApp:
         results_frame.pack(fill=tk.X, padx=10, pady=5)
 
         self.results_tree = ttk.Treeview(
-            results_frame, columns=("operator", "area"), show="headings"
+            results_frame,
+            columns=[key for key, _ in COLUMNS],
+            show="headings",
+            height=5,
         )
-        self.results_tree.heading("operator", text="Оператор")
-        self.results_tree.heading("area", text="Площадь контуров")
+        for key, title in COLUMNS:
+            # Клик по заголовку сортирует таблицу по колонке
+            self.results_tree.heading(
+                key, text=title, command=lambda k=key: self.sort_results(k)
+            )
+            self.results_tree.column(key, width=110, anchor=tk.CENTER)
         self.results_tree.pack(fill=tk.X, padx=5, pady=5)
 
     def load_image(self):
@@ -99,137 +153,214 @@ class EdgeDetectionApp:
         )
         if file_path:
             try:
-                self.original_image = cv2.imread(file_path)
-                self.display_image(self.original_image, self.original_image_label)
+                image = cv2.imread(file_path)
+                if image is None:
+                    raise ValueError("неподдерживаемый формат файла")
+
+                # Новое изображение делает недействительными все кэши
+                self.cancel_current_task()
+                self.operator_cache.clear()
+                self.display_cache.clear()
+                self.metrics_cache.clear()
+                self.update_results()
+                self.original_image = image
+                self.processed_image = None
+                self.processed_image_label.configure(image="")
+                self.display_image(
+                    self.original_image, self.original_image_label, "original"
+                )
             except Exception as e:
                 messagebox.showerror(
                     "Ошибка", f"Не удалось загрузить изображение: {str(e)}"
                 )
 
-    def display_image(self, cv_image, label):
-        if cv_image is None:
-            return
-
-        # Конвертация из BGR в RGB
-        rgb_image = cv2.cvtColor(cv_image, cv2.COLOR_BGR2RGB)
+    @staticmethod
+    def make_display_proxy(cv_image, max_size=400):
+        """Уменьшенная RGB-копия изображения для отображения"""
+        # Результаты операторов одноканальные, исходное изображение - BGR
+        if cv_image.ndim == 2:
+            rgb_image = cv2.cvtColor(cv_image, cv2.COLOR_GRAY2RGB)
+        else:
+            rgb_image = cv2.cvtColor(cv_image, cv2.COLOR_BGR2RGB)
 
         # Изменение размера изображения для отображения
         height, width = rgb_image.shape[:2]
-        max_size = 400
         if height > max_size or width > max_size:
             scale = max_size / max(height, width)
             new_width = int(width * scale)
             new_height = int(height * scale)
-            rgb_image = cv2.resize(rgb_image, (new_width, new_height))
+            rgb_image = cv2.resize(
+                rgb_image, (new_width, new_height), interpolation=cv2.INTER_AREA
+            )
+
+        return Image.fromarray(rgb_image)
+
+    def display_image(self, cv_image, label, cache_key=None, proxy=None):
+        if cv_image is None:
+            return
 
-        # Конвертация в формат для Tkinter
-        image = Image.fromarray(rgb_image)
-        photo = ImageTk.PhotoImage(image=image)
+        photo = self.display_cache.get(cache_key) if cache_key else None
+        if photo is None:
+            if proxy is None:
+                proxy = self.make_display_proxy(cv_image)
+            # PhotoImage создается только в потоке Tk
+            photo = ImageTk.PhotoImage(image=proxy)
+            if cache_key:
+                self.display_cache[cache_key] = photo
 
         label.configure(image=photo)
         label.image = photo
 
+    def run_operator(self, operator, image, cancel_event=None):
+        """Вызов оператора по имени"""
+        operators = {
+            "roberts": self.apply_roberts,
+            "prewitt": self.apply_prewitt,
+            "sobel": self.apply_sobel,
+            "log": self.apply_log,
+            "canny": self.apply_canny,
+        }
+        return operators[operator](image, cancel_event)
+
+    def cancel_current_task(self):
+        """Отмена выполняемой или ожидающей задачи"""
+        if self.current_task is not None:
+            self.cancel_event.set()
+            self.current_task.cancel()
+        self.current_task = None
+        self.cancel_event = None
+        self.root.config(cursor="")
+
+    def on_operator_change(self, *args):
+        """Переключение оператора в меню: из кэша мгновенно, иначе в фоне"""
+        if self.original_image is None:
+            return
+
+        self.apply_operator()
+
     def apply_operator(self):
         if self.original_image is None:
             messagebox.showwarning("Предупреждение", "Сначала загрузите изображение")
             return
 
         operator = self.current_operator.get()
+        if operator in self.operator_cache:
+            self.cancel_current_task()
+            self.processed_image = self.operator_cache[operator]
+            self.display_image(
+                self.processed_image, self.processed_image_label, operator
+            )
+            return
+
+        # Предыдущий запрос больше не нужен
+        self.cancel_current_task()
+        cancel_event = threading.Event()
+        self.cancel_event = cancel_event
+        self.current_task = self.executor.submit(
+            self._operator_task, operator, self.original_image, cancel_event
+        )
+        self.root.config(cursor="watch")
+        self.root.after(50, self._poll_task, self.current_task, operator)
+
+    def _operator_task(self, operator, image, cancel_event):
+        """Выполняется в фоновом потоке: оператор, метрики и уменьшенная копия"""
+        if cancel_event.is_set():
+            raise TaskCancelled()
+        processed = self.run_operator(operator, image, cancel_event)
+        if processed is None or cancel_event.is_set():
+            raise TaskCancelled()
+        binary, metrics = compute_metrics(processed)
+        proxy = self.make_display_proxy(processed)
+        return processed, proxy, binary, metrics
+
+    def _poll_task(self, task, operator):
+        """Проверка готовности фоновой задачи из цикла Tk"""
+        if task is not self.current_task:
+            return
+        if not task.done():
+            self.root.after(50, self._poll_task, task, operator)
+            return
+
+        self.current_task = None
+        self.cancel_event = None
+        self.root.config(cursor="")
         try:
-            if operator == "roberts":
-                self.processed_image = self.apply_roberts(self.original_image)
-            elif operator == "prewitt":
-                self.processed_image = self.apply_prewitt(self.original_image)
-            elif operator == "sobel":
-                self.processed_image = self.apply_sobel(self.original_image)
-            elif operator == "log":
-                self.processed_image = self.apply_log(self.original_image)
-            elif operator == "canny":
-                self.processed_image = self.apply_canny(self.original_image)
-
-            self.display_image(self.processed_image, self.processed_image_label)
-            self.update_results(operator)
+            processed, proxy, binary, metrics = task.result()
+        except TaskCancelled:
+            return
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка при применении оператора: {str(e)}")
+            return
 
-    def apply_roberts(self, image):
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-
-        # Ядра Робертса
-        kernel_x = np.array([[1, 0], [0, -1]], dtype=np.float32)
-        kernel_y = np.array([[0, 1], [-1, 0]], dtype=np.float32)
-
-        # Применение оператора
-        roberts_x = cv2.filter2D(gray, -1, kernel_x)
-        roberts_y = cv2.filter2D(gray, -1, kernel_y)
-
-        # Вычисление градиента
-        roberts = np.sqrt(np.square(roberts_x) + np.square(roberts_y))
-        roberts = np.uint8(roberts * 255 / np.max(roberts))
-
-        return cv2.cvtColor(roberts, cv2.COLOR_GRAY2BGR)
-
-    def apply_prewitt(self, image):
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-
-        # Ядра Превитта
-        kernel_x = np.array([[-1, 0, 1], [-1, 0, 1], [-1, 0, 1]], dtype=np.float32)
-        kernel_y = np.array([[-1, -1, -1], [0, 0, 0], [1, 1, 1]], dtype=np.float32)
-
-        # Применение оператора
-        prewitt_x = cv2.filter2D(gray, -1, kernel_x)
-        prewitt_y = cv2.filter2D(gray, -1, kernel_y)
-
-        # Вычисление градиента
-        prewitt = np.sqrt(np.square(prewitt_x) + np.square(prewitt_y))
-        prewitt = np.uint8(prewitt * 255 / np.max(prewitt))
-
-        return cv2.cvtColor(prewitt, cv2.COLOR_GRAY2BGR)
-
-    def apply_log(self, image):
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-
-        # Применение размытия по Гауссу
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-
-        # Применение оператора Лапласа
-        laplacian = cv2.Laplacian(blurred, cv2.CV_64F)
-
-        # Нормализация результата
-        log = np.uint8(np.absolute(laplacian) * 255 / np.max(np.absolute(laplacian)))
+        self.operator_cache[operator] = processed
+        self.processed_image = processed
+        self.display_image(processed, self.processed_image_label, operator, proxy)
+        self.metrics_cache.store(operator, binary, metrics)
+        self.update_results()
 
-        return cv2.cvtColor(log, cv2.COLOR_GRAY2BGR)
+    def apply_roberts(self, image, cancel_event=None):
+        return self.tiled_executor.run(image, "roberts", cancel_event)
 
-    def apply_canny(self, image):
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    def apply_prewitt(self, image, cancel_event=None):
+        return self.tiled_executor.run(image, "prewitt", cancel_event)
 
-        # Применение размытия по Гауссу
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    def apply_log(self, image, cancel_event=None):
+        return self.tiled_executor.run(image, "log", cancel_event)
 
-        # Применение оператора Канни
-        canny = cv2.Canny(blurred, threshold1=100, threshold2=200)
+    def apply_canny(self, image, cancel_event=None):
+        return self.tiled_executor.run(image, "canny", cancel_event)
 
-        return cv2.cvtColor(canny, cv2.COLOR_GRAY2BGR)
+    def apply_sobel(self, image, cancel_event=None):
+        return self.tiled_executor.run(image, "sobel", cancel_event)
 
-    def apply_sobel(self, image):
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        sobel_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-        sobel_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-        sobel = np.sqrt(sobel_x**2 + sobel_y**2)
-        sobel = np.uint8(sobel * 255 / np.max(sobel))
-        return cv2.cvtColor(sobel, cv2.COLOR_GRAY2BGR)
+    def update_results(self):
+        """Перезаполнение таблицы из кэша метрик (без пересчета)"""
+        for item in self.results_tree.get_children():
+            self.results_tree.delete(item)
 
-    def update_results(self, operator):
-        if self.processed_image is None:
+        for row in self.metrics_cache.rows(self.sort_key, self.sort_reverse):
+            values = []
+            for key, _ in COLUMNS:
+                value = row[key]
+                if value is None:
+                    value = "-"
+                elif isinstance(value, float):
+                    value = f"{value:.3f}" if key in ("iou", "f1") else f"{value:.1f}"
+                values.append(value)
+            self.results_tree.insert("", "end", values=values)
+
+    def sort_results(self, key):
+        """Сортировка таблицы по колонке; повторный клик меняет порядок"""
+        if self.sort_key == key:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_key = key
+            self.sort_reverse = key != "operator"
+        self.update_results()
+
+    def on_reference_change(self, *args):
+        self.metrics_cache.set_reference(self.reference_operator.get())
+        self.update_results()
+
+    def export_results(self):
+        if not self.metrics_cache.metrics:
+            messagebox.showwarning("Предупреждение", "Нет результатов для экспорта")
             return
 
-        # Расчет площади контуров (пример)
-        gray = cv2.cvtColor(self.processed_image, cv2.COLOR_BGR2GRAY)
-        _, binary = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
-        area = np.sum(binary > 0)
-
-        # Добавление результатов в таблицу
-        self.results_tree.insert("", "end", values=(operator, area))
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+        )
+        if file_path:
+            try:
+                self.metrics_cache.export_csv(
+                    file_path, self.sort_key, self.sort_reverse
+                )
+                messagebox.showinfo("Успех", "Результаты успешно экспортированы")
+            except Exception as e:
+                messagebox.showerror(
+                    "Ошибка", f"Не удалось экспортировать результаты: {str(e)}"
+                )
 
     def save_result(self):
         if self.processed_image is None:
@@ -256,12 +387,20 @@ class EdgeDetectionApp:
                 )
 
     def clear_images(self):
+        self.cancel_current_task()
+        self.operator_cache.clear()
+        self.display_cache.clear()
+        self.metrics_cache.clear()
         self.original_image = None
         self.processed_image = None
         self.original_image_label.configure(image="")
         self.processed_image_label.configure(image="")
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
+        self.update_results()
+
+    def on_close(self):
+        self.cancel_current_task()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.root.quit()
 
 
 if __name__ == "__main__":
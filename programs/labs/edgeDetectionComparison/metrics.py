@@ -0,0 +1,142 @@
+import csv
+import cv2
+import numpy as np
+
+# Порог бинаризации результата оператора
+EDGE_THRESHOLD = 127
+
+# Колонки таблицы результатов: ключ метрики и заголовок
+COLUMNS = [
+    ("operator", "Оператор"),
+    ("area", "Площадь контуров"),
+    ("components", "Компонент"),
+    ("mean_component_area", "Ср. площадь компоненты"),
+    ("largest_component", "Макс. компонента"),
+    ("edge_length", "Длина контуров"),
+    ("mean_strength", "Ср. сила градиента"),
+    ("iou", "IoU с эталоном"),
+    ("f1", "F1 с эталоном"),
+]
+
+
+def to_gray(image):
+    """Приведение результата оператора к одному каналу"""
+    if image.ndim == 3:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image
+
+
+def edge_length(binary):
+    """Оценка длины контуров по связям соседних пикселей
+
+    Горизонтальные и вертикальные связи считаются с весом 1,
+    диагональные (без обходного ортогонального пути) - с весом √2.
+    """
+    b = binary
+    orthogonal = np.count_nonzero(b[:, :-1] & b[:, 1:]) + np.count_nonzero(
+        b[:-1, :] & b[1:, :]
+    )
+    # Диагональ учитывается, только если оба угловых соседа пусты
+    diag_main = b[:-1, :-1] & b[1:, 1:] & ~b[:-1, 1:] & ~b[1:, :-1]
+    diag_anti = b[:-1, 1:] & b[1:, :-1] & ~b[:-1, :-1] & ~b[1:, 1:]
+    diagonal = np.count_nonzero(diag_main) + np.count_nonzero(diag_anti)
+    return float(orthogonal + np.sqrt(2) * diagonal)
+
+
+def compute_metrics(edge_image, threshold=EDGE_THRESHOLD):
+    """Метрики контуров за один векторизованный проход
+
+    Возвращает бинарную карту контуров (для сравнения операторов)
+    и словарь метрик.
+    """
+    gray = to_gray(edge_image)
+    binary = gray > threshold
+    area = int(np.count_nonzero(binary))
+
+    # Статистика связных компонент (метка 0 - фон)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(
+        binary.view(np.uint8), connectivity=8
+    )
+    areas = stats[1:, cv2.CC_STAT_AREA]
+
+    metrics = {
+        "area": area,
+        "components": int(count - 1),
+        "mean_component_area": float(areas.mean()) if areas.size else 0.0,
+        "largest_component": int(areas.max()) if areas.size else 0,
+        "edge_length": edge_length(binary),
+        "mean_strength": float(gray[binary].mean()) if area else 0.0,
+    }
+    return binary, metrics
+
+
+def agreement(binary, reference):
+    """Согласованность двух карт контуров: IoU и F1"""
+    tp = np.count_nonzero(binary & reference)
+    fp = np.count_nonzero(binary & ~reference)
+    fn = np.count_nonzero(~binary & reference)
+
+    union = tp + fp + fn
+    iou = tp / union if union else 1.0
+    f1 = 2 * tp / (2 * tp + fp + fn) if union else 1.0
+    return {"iou": float(iou), "f1": float(f1)}
+
+
+class MetricsCache:
+    """Кэш метрик по операторам для сортировки и экспорта без пересчета"""
+
+    def __init__(self, reference="canny"):
+        self.reference = reference
+        self.binaries = {}
+        self.metrics = {}
+        self.agreements = {}
+
+    def store(self, operator, binary, metrics):
+        self.binaries[operator] = binary
+        self.metrics[operator] = metrics
+        # Изменилась карта оператора - сравнение нужно пересчитать
+        if operator == self.reference:
+            self.agreements.clear()
+        else:
+            self.agreements.pop(operator, None)
+
+    def set_reference(self, operator):
+        if operator != self.reference:
+            self.reference = operator
+            self.agreements.clear()
+
+    def get_agreement(self, operator):
+        """IoU/F1 относительно эталонного оператора (если он посчитан)"""
+        reference = self.binaries.get(self.reference)
+        if reference is None:
+            return {"iou": None, "f1": None}
+        if operator not in self.agreements:
+            self.agreements[operator] = agreement(self.binaries[operator], reference)
+        return self.agreements[operator]
+
+    def rows(self, sort_key=None, reverse=False):
+        """Строки таблицы, при необходимости отсортированные по метрике"""
+        rows = []
+        for operator, metrics in self.metrics.items():
+            row = {"operator": operator, **metrics, **self.get_agreement(operator)}
+            rows.append(row)
+
+        if sort_key is not None:
+            # Пустые значения всегда в конце
+            present = [r for r in rows if r[sort_key] is not None]
+            missing = [r for r in rows if r[sort_key] is None]
+            present.sort(key=lambda r: r[sort_key], reverse=reverse)
+            rows = present + missing
+        return rows
+
+    def export_csv(self, file_path, sort_key=None, reverse=False):
+        with open(file_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=[key for key, _ in COLUMNS])
+            writer.writeheader()
+            for row in self.rows(sort_key, reverse):
+                writer.writerow(row)
+
+    def clear(self):
+        self.binaries.clear()
+        self.metrics.clear()
+        self.agreements.clear()
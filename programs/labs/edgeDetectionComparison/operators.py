@@ -0,0 +1,92 @@
+import cv2
+import numpy as np
+
+# Ядра Робертса
+ROBERTS_X = np.array([[1, 0], [0, -1]], dtype=np.float32)
+ROBERTS_Y = np.array([[0, 1], [-1, 0]], dtype=np.float32)
+
+# Ядра Превитта
+PREWITT_X = np.array([[-1, 0, 1], [-1, 0, 1], [-1, 0, 1]], dtype=np.float32)
+PREWITT_Y = np.array([[-1, -1, -1], [0, 0, 0], [1, 1, 1]], dtype=np.float32)
+
+# Размытие по Гауссу перед LoG и Канни
+BLUR_SIZE = 5
+BLUR_RADIUS = BLUR_SIZE // 2
+
+
+def to_gray(image):
+    if image.ndim == 3:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image
+
+
+def roberts_response(image):
+    """Модуль градиента Робертса (float32)"""
+    gray = to_gray(image)
+    roberts_x = cv2.filter2D(gray, cv2.CV_32F, ROBERTS_X)
+    roberts_y = cv2.filter2D(gray, cv2.CV_32F, ROBERTS_Y)
+    return cv2.magnitude(roberts_x, roberts_y)
+
+
+def prewitt_response(image):
+    """Модуль градиента Превитта (float32)"""
+    gray = to_gray(image)
+    prewitt_x = cv2.filter2D(gray, cv2.CV_32F, PREWITT_X)
+    prewitt_y = cv2.filter2D(gray, cv2.CV_32F, PREWITT_Y)
+    return cv2.magnitude(prewitt_x, prewitt_y)
+
+
+def sobel_response(image):
+    """Модуль градиента Собела (float32)"""
+    gray = to_gray(image)
+    sobel_x = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)
+    sobel_y = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3)
+    return cv2.magnitude(sobel_x, sobel_y)
+
+
+def log_response(image):
+    """Модуль лапласиана гауссиана (float32)"""
+    gray = to_gray(image)
+    blurred = cv2.GaussianBlur(gray, (BLUR_SIZE, BLUR_SIZE), 0)
+    laplacian = cv2.Laplacian(blurred, cv2.CV_32F)
+    return np.absolute(laplacian, out=laplacian)
+
+
+def canny_edges(image):
+    """Карта контуров Канни (uint8, нормализация не нужна)"""
+    gray = to_gray(image)
+    blurred = cv2.GaussianBlur(gray, (BLUR_SIZE, BLUR_SIZE), 0)
+    return cv2.Canny(blurred, threshold1=100, threshold2=200)
+
+
+# Оператор: (функция, ширина ореола в пикселях, нужна ли нормализация по максимуму)
+# Ореол равен радиусу опоры ядра; для Канни добавлен пиксель на подавление
+# немаксимумов, которому нужны градиенты соседей.
+OPERATORS = {
+    "roberts": (roberts_response, 1, True),
+    "prewitt": (prewitt_response, 1, True),
+    "sobel": (sobel_response, 1, True),
+    "log": (log_response, BLUR_RADIUS + 1, True),
+    "canny": (canny_edges, BLUR_RADIUS + 2, False),
+}
+
+
+def normalize(response, max_value, out=None):
+    """Масштабирование отклика в [0, 255] по глобальному максимуму"""
+    if out is None:
+        out = np.empty(response.shape, dtype=np.uint8)
+    if max_value > 0:
+        np.multiply(response, 255.0 / max_value, out=response)
+        out[...] = response  # приведение с отбрасыванием дробной части
+    else:
+        out[...] = 0
+    return out
+
+
+def apply_operator(image, operator):
+    """Применение оператора ко всему изображению в памяти"""
+    function, _, normalized = OPERATORS[operator]
+    response = function(image)
+    if normalized:
+        return normalize(response, float(response.max()))
+    return response
@@ -1,3 +1,7 @@
+import time
+
+import numpy as np
+
 from services.gateway.api_gateway import APIGateway
 
 
@@ -177,3 +181,89 @@ def example_dense_network():
     best_path, length = gateway.find_optimal_path(chromosome_length=3)
     print("Found path:", best_path)
     print("Path length:", length)
+
+
+def example_island_network():
+    """Example 6: Grid network (9 nodes) solved by 4 islands in parallel"""
+    gateway = APIGateway()
+
+    # Grid network with 9 nodes (3x3 grid)
+    matrix = [
+        [0, 1, 0, 1, 0, 0, 0, 0, 0],  # 0
+        [1, 0, 1, 0, 1, 0, 0, 0, 0],  # 1
+        [0, 1, 0, 0, 0, 1, 0, 0, 0],  # 2
+        [1, 0, 0, 0, 1, 0, 1, 0, 0],  # 3
+        [0, 1, 0, 1, 0, 1, 0, 1, 0],  # 4
+        [0, 0, 1, 0, 1, 0, 0, 0, 1],  # 5
+        [0, 0, 0, 1, 0, 0, 0, 1, 0],  # 6
+        [0, 0, 0, 0, 1, 0, 1, 0, 1],  # 7
+        [0, 0, 0, 0, 0, 1, 0, 1, 0],  # 8
+    ]
+
+    gateway.configure_network(9, matrix)
+    gateway.configure_algorithm(
+        {
+            "population_size": 30,
+            "generations": 100,
+            "mutation_rate": 0.1,
+            "crossover_rate": 0.9,
+            "islands": 4,
+            "migration_interval": 10,
+            "migration_size": 2,
+            "topology": "ring",
+            "seed": 42,
+        }
+    )
+    gateway.set_path_ends(0, 8)
+
+    print("\nExample 6: Island Model")
+    print("Network size: 9 nodes (3x3 grid), 4 islands, ring migration")
+    print("Looking for path from node 0 to node 8")
+
+    best_path, length = gateway.find_optimal_path(chromosome_length=5)
+    print("Found path:", best_path)
+    print("Path length:", length)
+
+
+def example_large_sparse_network():
+    """Example 7: Ring road with shortcuts (50 000 nodes) on the sparse backend"""
+    gateway = APIGateway()
+
+    # Ring road 0-1-2-...-0 plus random long shortcuts, as an edge list
+    size = 50_000
+    rng = np.random.default_rng(7)
+    ring = np.arange(size)
+    ring_edges = np.column_stack([ring, (ring + 1) % size, rng.integers(1, 10, size)])
+    shortcuts = np.column_stack(
+        [
+            rng.integers(0, size, 2 * size),
+            rng.integers(0, size, 2 * size),
+            rng.integers(20, 100, 2 * size),
+        ]
+    )
+    edges = np.concatenate([ring_edges, shortcuts])
+
+    start = time.perf_counter()
+    gateway.configure_network_edges(size, edges, symmetric=True)
+    load_time = time.perf_counter() - start
+
+    gateway.configure_algorithm(
+        {
+            "population_size": 5000,
+            "generations": 30,
+            "mutation_rate": 0.3,
+            "crossover_rate": 0.7,
+            "seed": 7,
+        }
+    )
+    gateway.set_path_ends(0, 2)
+
+    print("\nExample 7: Large Sparse Network")
+    print(
+        f"Network size: {size} nodes, {len(edges)} edges (loaded in {load_time:.3f} s)"
+    )
+    print("Looking for path from node 0 to node 2")
+
+    best_path, length = gateway.find_optimal_path(chromosome_length=1)
+    print("Found path:", best_path)
+    print("Path length:", length)
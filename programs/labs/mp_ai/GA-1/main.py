@@ -19,6 +19,8 @@ def main():
     # examples.example_complex_network()
     # examples.example_sparse_network()
     # examples.example_dense_network()
+    # examples.example_island_network()
+    # examples.example_large_sparse_network()
 
 
 if __name__ == "__main__":
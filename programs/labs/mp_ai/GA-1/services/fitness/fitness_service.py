@@ -1,3 +1,4 @@
+import numpy as np
 from typing import List
 from services.network.network_service import NetworkService
 
@@ -23,6 +24,18 @@ class FitnessService:
 
         return 1.0 / length if length > 0 else 0.0
 
-    def calculate_population_fitness(self, population: List[List[int]]) -> List[float]:
-        """Calculate fitness scores for entire population"""
-        return [self.calculate_fitness(chromo) for chromo in population]
+    def calculate_population_fitness(self, population: np.ndarray) -> np.ndarray:
+        """Calculate fitness scores for entire population at once"""
+        size = len(population)
+        paths = np.column_stack(
+            [
+                np.full(size, self.start_node),
+                population,
+                np.full(size, self.end_node),
+            ]
+        )
+        is_valid, lengths = self.network_service.validate_paths(paths)
+
+        fitness = np.zeros(size)
+        np.divide(1.0, lengths, out=fitness, where=is_valid & (lengths > 0))
+        return fitness
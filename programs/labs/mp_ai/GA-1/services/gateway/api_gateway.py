@@ -1,10 +1,12 @@
-from typing import List, Tuple, Dict, Any
+from typing import List, Sequence, Tuple, Dict, Any
 from services.genetic.genetic_service import GeneticService
+from services.island.island_service import IslandService
 
 
 class APIGateway:
     def __init__(self):
         self.genetic_service = GeneticService()
+        self.island_service = IslandService(self.genetic_service)
         self.author_info = {
             "author": "Зарубин Александр Николаевич",
             "email": "zarubin_14@list.com",
@@ -19,6 +21,20 @@ class APIGateway:
         """Configure network topology"""
         self.genetic_service.set_network(size, adj_matrix)
 
+    def configure_network_edges(
+        self,
+        size: int,
+        edges: Sequence[Tuple[int, int, float]],
+        symmetric: bool = False,
+    ) -> None:
+        """Configure sparse network topology from (source, target, weight) edges
+
+        Edges are directed, as rows of the adjacency matrix in
+        configure_network; pass symmetric=True to add every edge in both
+        directions.
+        """
+        self.genetic_service.set_network_edges(size, edges, symmetric)
+
     def configure_algorithm(self, params: Dict[str, Any]) -> None:
         """Configure algorithm parameters"""
         self.genetic_service.set_algorithm_params(
@@ -26,6 +42,15 @@ class APIGateway:
             generations=params.get("generations", 100),
             mutation_rate=params.get("mutation_rate", 0.1),
             crossover_rate=params.get("crossover_rate", 0.9),
+            seed=params.get("seed"),
+        )
+        self.island_service.set_parameters(
+            islands=params.get("islands", 1),
+            migration_interval=params.get("migration_interval", 10),
+            migration_size=params.get("migration_size", 2),
+            topology=params.get("topology", "ring"),
+            max_workers=params.get("max_workers"),
+            seed=params.get("seed"),
         )
 
     def set_path_ends(self, start: int, end: int) -> None:
@@ -37,5 +62,7 @@ class APIGateway:
         self.genetic_service.set_step_mode(mode)
 
     def find_optimal_path(self, chromosome_length: int = 5) -> Tuple[List[int], float]:
-        """Find optimal path using genetic algorithm"""
+        """Find optimal path using genetic algorithm (island model if islands > 1)"""
+        if self.island_service.islands > 1:
+            return self.island_service.find_path(chromosome_length)
         return self.genetic_service.find_path(chromosome_length)
@@ -1,4 +1,5 @@
-from typing import List, Tuple
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
 from services.network.network_service import NetworkService
 from services.fitness.fitness_service import FitnessService
 from services.population.population_service import PopulationService
@@ -16,15 +17,26 @@ class GeneticService:
         """Set network topology"""
         self.network_service.set_network(size, adj_matrix)
 
+    def set_network_edges(
+        self,
+        size: int,
+        edges: Sequence[Tuple[int, int, float]],
+        symmetric: bool = False,
+    ) -> None:
+        """Set sparse network topology from an edge list"""
+        self.network_service.set_network_edges(size, edges, symmetric)
+
     def set_algorithm_params(
         self,
         pop_size: int,
         generations: int,
         mutation_rate: float,
         crossover_rate: float,
+        seed: Optional[int] = None,
     ) -> None:
-        """Set algorithm parameters"""
+        """Set algorithm parameters (a fixed seed makes runs reproducible)"""
         self.generations = generations
+        self.population_service.set_seed(seed)
         self.population_service.set_parameters(
             pop_size=pop_size,
             tournament_size=3,
@@ -40,6 +52,25 @@ class GeneticService:
         """Set step mode for debugging"""
         self.step_mode = mode
 
+    def next_generation(
+        self, population: np.ndarray, fitness: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Produce the next generation and its fitness"""
+        # Selection
+        selected = self.population_service.tournament_selection(population, fitness)
+
+        # Crossover
+        new_population = self.population_service.crossover(selected)
+
+        # Mutation
+        new_population = self.population_service.mutate(new_population)
+        new_fitness = self.fitness_service.calculate_population_fitness(new_population)
+
+        # Population reduction
+        return self.population_service.reduce_population(
+            population, fitness, new_population, new_fitness
+        )
+
     def find_path(self, chromosome_length: int = 5) -> Tuple[List[int], float]:
         """Find optimal path using genetic algorithm"""
         # Initialize population
@@ -50,48 +81,30 @@ class GeneticService:
             if self.step_mode:
                 self._print_generation_info(generation, population, fitness)
 
-            # Selection
-            selected = self.population_service.tournament_selection(population, fitness)
-
-            # Crossover
-            new_population = []
-            for i in range(0, len(selected) - 1, 2):
-                child1, child2 = self.population_service.crossover(
-                    selected[i], selected[i + 1]
-                )
-                new_population.extend([child1, child2])
-
-            if len(new_population) < len(population):
-                new_population.append(selected[-1])
-
-            # Mutation
-            new_population = [
-                self.population_service.mutate(chromo) for chromo in new_population
-            ]
-            new_fitness = self.fitness_service.calculate_population_fitness(
-                new_population
-            )
-
-            # Population reduction
-            population, fitness = self.population_service.reduce_population(
-                population, fitness, new_population, new_fitness
-            )
+            population, fitness = self.next_generation(population, fitness)
 
             if not self.step_mode:
-                best_fit = max(fitness)
-                avg_fit = sum(fitness) / len(fitness)
+                best_fit = fitness.max()
+                avg_fit = fitness.mean()
                 print(
                     f"Generation {generation}: Best fitness = {best_fit:.4f}, Average fitness = {avg_fit:.4f}"
                 )
 
-        # Return best path found
-        best_idx = fitness.index(max(fitness))
+        return self.best_path(population, fitness)
+
+    def best_path(
+        self, population: np.ndarray, fitness: np.ndarray
+    ) -> Tuple[List[int], float]:
+        """Best path found in the population and its length"""
+        best_idx = int(np.argmax(fitness))
         best_path = (
             [self.fitness_service.start_node]
-            + population[best_idx]
+            + population[best_idx].tolist()
             + [self.fitness_service.end_node]
         )
-        best_length = 1 / fitness[best_idx] if fitness[best_idx] > 0 else float("inf")
+        best_length = (
+            float(1 / fitness[best_idx]) if fitness[best_idx] > 0 else float("inf")
+        )
 
         # Clean path (remove consecutive duplicates)
         cleaned_path = [best_path[0]]
@@ -102,11 +115,11 @@ class GeneticService:
         return cleaned_path, best_length
 
     def _print_generation_info(
-        self, generation: int, population: List[List[int]], fitness: List[float]
+        self, generation: int, population: np.ndarray, fitness: np.ndarray
     ) -> None:
         """Print detailed generation information in step mode"""
         print(f"\nGeneration {generation}:")
         print("Population:")
         for i, (chromo, fit) in enumerate(zip(population, fitness)):
-            print(f"{i}: {chromo} (fitness: {fit:.4f})")
+            print(f"{i}: {chromo.tolist()} (fitness: {fit:.4f})")
         input("\nPress Enter to continue...")
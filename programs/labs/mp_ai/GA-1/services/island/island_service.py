@@ -0,0 +1,211 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.genetic.genetic_service import GeneticService
+
+TOPOLOGIES = ("ring", "full")
+
+# Per-process state of pool workers, set once by _init_worker
+_worker_service: Optional[GeneticService] = None
+_worker_memory: List[SharedMemory] = []
+
+# Shared network array: (key in NetworkService.get_arrays, block name, shape, dtype)
+ArraySpec = Tuple[str, str, Tuple[int, ...], str]
+
+
+def _share_arrays(
+    arrays: Dict[str, np.ndarray],
+) -> Tuple[List[SharedMemory], List[ArraySpec]]:
+    """Copy network arrays into shared memory blocks"""
+    blocks, specs = [], []
+    for key, array in arrays.items():
+        block = SharedMemory(create=True, size=max(array.nbytes, 1))
+        blocks.append(block)
+        # No view is kept in this process, so the block can be closed later
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        specs.append((key, block.name, array.shape, array.dtype.str))
+    return blocks, specs
+
+
+def _init_worker(
+    network_size: int,
+    specs: List[ArraySpec],
+    path_ends: Tuple[int, int],
+    parameters: Dict[str, Any],
+) -> None:
+    """Attach the shared network arrays and build a worker GeneticService"""
+    global _worker_service
+    arrays = {}
+    for key, name, shape, dtype in specs:
+        block = SharedMemory(name=name)
+        _worker_memory.append(block)
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        array.flags.writeable = False
+        arrays[key] = array
+
+    _worker_service = GeneticService()
+    _worker_service.network_service.attach_arrays(network_size, arrays)
+    _worker_service.set_path_ends(*path_ends)
+    _worker_service.population_service.set_parameters(**parameters)
+
+
+def _evolve_island(
+    population: np.ndarray,
+    fitness: np.ndarray,
+    rng: np.random.Generator,
+    generations: int,
+) -> Tuple[np.ndarray, np.ndarray, np.random.Generator]:
+    """Evolve one island for a number of generations in a worker process"""
+    _worker_service.population_service.rng = rng
+    for _ in range(generations):
+        population, fitness = _worker_service.next_generation(population, fitness)
+    return population, fitness, rng
+
+
+class IslandService:
+    def __init__(self, genetic_service: GeneticService):
+        self.genetic_service = genetic_service
+        self.islands = 1
+        self.migration_interval = 10
+        self.migration_size = 2
+        self.topology = "ring"
+        self.max_workers: Optional[int] = None
+        self.seed: Optional[int] = None
+
+    def set_parameters(
+        self,
+        islands: int,
+        migration_interval: int,
+        migration_size: int,
+        topology: str,
+        max_workers: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Set island model parameters"""
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown migration topology: {topology}")
+        if islands < 1 or migration_interval < 1 or migration_size < 0:
+            raise ValueError("Invalid island model parameters")
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.topology = topology
+        self.max_workers = max_workers
+        self.seed = seed
+
+    def neighbours(self, island: int) -> List[int]:
+        """Islands that receive migrants from the given island"""
+        if self.islands == 1:
+            return []
+        if self.topology == "ring":
+            return [(island + 1) % self.islands]
+        return [other for other in range(self.islands) if other != island]
+
+    def migrate(
+        self, populations: List[np.ndarray], fitnesses: List[np.ndarray]
+    ) -> None:
+        """Copy each island's best individuals over its neighbours' worst"""
+        if self.migration_size == 0:
+            return
+        # Emigrants are chosen before any island receives migrants
+        emigrants = []
+        for population, fitness in zip(populations, fitnesses):
+            best = np.argsort(-fitness, kind="stable")[: self.migration_size]
+            emigrants.append((population[best], fitness[best]))
+
+        incoming: List[List[Tuple[np.ndarray, np.ndarray]]] = [
+            [] for _ in range(self.islands)
+        ]
+        for island in range(self.islands):
+            for neighbour in self.neighbours(island):
+                incoming[neighbour].append(emigrants[island])
+
+        for island, arrivals in enumerate(incoming):
+            if not arrivals:
+                continue
+            migrants = np.concatenate([individuals for individuals, _ in arrivals])
+            migrant_fitness = np.concatenate([fitness for _, fitness in arrivals])
+            count = min(len(migrants), len(populations[island]))
+            worst = np.argsort(fitnesses[island], kind="stable")[:count]
+            populations[island][worst] = migrants[:count]
+            fitnesses[island][worst] = migrant_fitness[:count]
+
+    def find_path(self, chromosome_length: int = 5) -> Tuple[List[int], float]:
+        """Find optimal path with independent populations evolving in parallel
+
+        Islands run in a process pool for migration_interval generations at a
+        time, then exchange their best individuals. The network arrays (dense
+        matrix or CSR) are placed in shared memory once and mapped read-only
+        by every worker.
+        """
+        genetic = self.genetic_service
+        network = genetic.network_service
+        population_service = genetic.population_service
+        fitness_service = genetic.fitness_service
+
+        # Independent reproducible streams for every island
+        seeds = np.random.SeedSequence(self.seed).spawn(self.islands)
+        rngs = [np.random.default_rng(seed) for seed in seeds]
+
+        populations, fitnesses = [], []
+        main_rng = population_service.rng
+        for rng in rngs:
+            population_service.rng = rng
+            population = population_service.initialize_population(chromosome_length)
+            populations.append(population)
+            fitnesses.append(fitness_service.calculate_population_fitness(population))
+        population_service.rng = main_rng
+
+        blocks, specs = _share_arrays(network.get_arrays())
+        try:
+            parameters = {
+                "pop_size": population_service.population_size,
+                "tournament_size": population_service.tournament_size,
+                "mutation_rate": population_service.mutation_rate,
+                "crossover_rate": population_service.crossover_rate,
+            }
+            path_ends = (fitness_service.start_node, fitness_service.end_node)
+            workers = min(self.max_workers or os.cpu_count() or 1, self.islands)
+
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(network.network_size, specs, path_ends, parameters),
+            ) as pool:
+                generation = 0
+                while generation < genetic.generations:
+                    epoch = min(
+                        self.migration_interval, genetic.generations - generation
+                    )
+                    results = list(
+                        pool.map(
+                            _evolve_island,
+                            populations,
+                            fitnesses,
+                            rngs,
+                            [epoch] * self.islands,
+                        )
+                    )
+                    populations = [population for population, _, _ in results]
+                    fitnesses = [fitness for _, fitness, _ in results]
+                    rngs = [rng for _, _, rng in results]
+                    generation += epoch
+
+                    best = [fitness.max() for fitness in fitnesses]
+                    print(
+                        f"Generation {generation - 1}: Best fitness per island = "
+                        + ", ".join(f"{fit:.4f}" for fit in best)
+                    )
+
+                    if generation < genetic.generations:
+                        self.migrate(populations, fitnesses)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        return genetic.best_path(np.concatenate(populations), np.concatenate(fitnesses))
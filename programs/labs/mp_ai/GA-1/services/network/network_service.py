@@ -1,44 +1,176 @@
 import numpy as np
-from typing import List, Tuple
+from typing import Dict, List, Sequence, Tuple
+
+NO_CONNECTION = 1e9  # Large number for no connection
 
 
 class NetworkService:
+    """Network topology with a dense matrix or a sparse CSR backend
+
+    The dense backend keeps the full adjacency matrix (O(n^2) memory). The
+    sparse backend keeps only existing edges in CSR form: row offsets
+    (indptr), target nodes (indices) and weights, sorted by (source, target).
+    An edge u -> v is looked up by binary search of v in the row slice
+    indices[indptr[u]:indptr[u + 1]], in O(log degree) steps, which is
+    effectively O(1) for road-like networks. Both backends answer batches of
+    lookups with vectorized code.
+
+    In both backends a weight of 0 means "no connection".
+    """
+
     def __init__(self):
         self.network_size = 0
+        self.backend = "dense"
         self.adj_matrix = None
+        self.indptr = None
+        self.indices = None
+        self.weights = None
+        self.search_steps = 0
 
     def set_network(self, size: int, adj_matrix: List[List[float]]) -> None:
-        """Initialize network topology"""
+        """Initialize network topology from a dense adjacency matrix"""
         self.network_size = size
-        self.adj_matrix = np.array(adj_matrix)
+        self.backend = "dense"
+        self.adj_matrix = np.array(adj_matrix, dtype=np.float64)
 
         # Validate and correct adjacency matrix
-        for i in range(size):
-            for j in range(size):
-                if i == j:
-                    self.adj_matrix[i][j] = 0
-                elif self.adj_matrix[i][j] == 0:
-                    self.adj_matrix[i][j] = 1e9  # Large number for no connection
+        self.adj_matrix[self.adj_matrix == 0] = NO_CONNECTION
+        np.fill_diagonal(self.adj_matrix, 0)
+
+    def set_network_edges(
+        self,
+        size: int,
+        edges: Sequence[Tuple[int, int, float]],
+        symmetric: bool = False,
+    ) -> None:
+        """Initialize network topology from an edge list (source, target, weight)
+
+        With symmetric=True every edge is also added in the opposite
+        direction. Self-loops and edges with weight 0 (no connection, as in
+        set_network) are ignored; for repeated edges the shortest one is
+        kept.
+        """
+        edges = np.asarray(edges, dtype=np.float64).reshape(-1, 3)
+        sources = edges[:, 0].astype(np.int64)
+        targets = edges[:, 1].astype(np.int64)
+        weights = edges[:, 2]
+        if symmetric:
+            sources, targets = (
+                np.concatenate([sources, targets]),
+                np.concatenate([targets, sources]),
+            )
+            weights = np.concatenate([weights, weights])
+
+        if (
+            (sources < 0) | (sources >= size) | (targets < 0) | (targets >= size)
+        ).any():
+            raise ValueError(f"Edge endpoints must be in range 0..{size - 1}")
+        keep = (sources != targets) & (weights != 0)
+        keys = sources[keep] * size + targets[keep]
+        weights = weights[keep]
+
+        # Sort by key, then by weight, and keep the first (shortest) duplicate
+        order = np.lexsort((weights, keys))
+        keys, weights = keys[order], weights[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = keys[1:] != keys[:-1]
+        self._set_csr(size, keys[first], weights[first])
+
+    def _set_csr(self, size: int, edge_keys: np.ndarray, weights: np.ndarray) -> None:
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edge_keys // size, minlength=size), out=indptr[1:])
+        self.attach_arrays(
+            size, {"indptr": indptr, "indices": edge_keys % size, "weights": weights}
+        )
+
+    def get_arrays(self) -> Dict[str, np.ndarray]:
+        """Arrays that fully describe the network (for sharing between processes)"""
+        if self.backend == "dense":
+            return {"adj_matrix": self.adj_matrix}
+        return {
+            "indptr": self.indptr,
+            "indices": self.indices,
+            "weights": self.weights,
+        }
+
+    def attach_arrays(self, size: int, arrays: Dict[str, np.ndarray]) -> None:
+        """Use arrays from get_arrays (e.g. in shared memory) without copying"""
+        self.network_size = size
+        if "adj_matrix" in arrays:
+            self.backend = "dense"
+            self.adj_matrix = arrays["adj_matrix"]
+            return
+        self.backend = "sparse"
+        self.adj_matrix = None
+        self.indptr = arrays["indptr"]
+        self.indices = arrays["indices"]
+        self.weights = arrays["weights"]
+        # Halvings needed to search the longest row slice
+        max_degree = int(np.diff(self.indptr).max()) if size else 0
+        self.search_steps = max_degree.bit_length()
+
+    def edge_weights(self, from_nodes: np.ndarray, to_nodes: np.ndarray) -> np.ndarray:
+        """Weights of edges from_nodes -> to_nodes, NO_CONNECTION where missing"""
+        if self.backend == "dense":
+            return self.adj_matrix[from_nodes, to_nodes]
+
+        from_nodes = np.asarray(from_nodes, dtype=np.int64)
+        to_nodes = np.asarray(to_nodes, dtype=np.int64)
+        result = np.full(from_nodes.shape, NO_CONNECTION)
+        if len(self.indices):
+            # Lower bound of to_nodes in each row slice, all lookups at once
+            low = self.indptr[from_nodes]
+            row_end = self.indptr[from_nodes + 1]
+            high = row_end
+            last = len(self.indices) - 1
+            for _ in range(self.search_steps):
+                middle = (low + high) // 2
+                active = low < high
+                right = active & (self.indices[np.minimum(middle, last)] < to_nodes)
+                low = np.where(right, middle + 1, low)
+                high = np.where(active & ~right, middle, high)
+            position = np.minimum(low, last)
+            found = (low < row_end) & (self.indices[position] == to_nodes)
+            result[found] = self.weights[position[found]]
+        # Staying in place costs nothing, as on the dense diagonal
+        result[from_nodes == to_nodes] = 0
+        return result
 
     def validate_path(self, path: List[int]) -> Tuple[bool, float]:
         """Validate path and calculate its length"""
-        total_length = 0
-
-        for i in range(len(path) - 1):
-            from_node = path[i]
-            to_node = path[i + 1]
+        is_valid, lengths = self.validate_paths(np.asarray([path]))
+        return bool(is_valid[0]), float(lengths[0])
 
-            if from_node == to_node or self.adj_matrix[from_node][to_node] >= 1e9:
-                return False, float("inf")
+    def validate_paths(self, paths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Validate a batch of paths (one per row) and calculate their lengths"""
+        from_nodes = paths[:, :-1]
+        to_nodes = paths[:, 1:]
+        weights = self.edge_weights(from_nodes, to_nodes)
 
-            total_length += self.adj_matrix[from_node][to_node]
+        is_valid = ~((from_nodes == to_nodes) | (weights >= NO_CONNECTION)).any(axis=1)
+        lengths = np.where(is_valid, weights.sum(axis=1), np.inf)
+        return is_valid, lengths
 
-        return True, total_length
+    def get_neighbours(self, node: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Nodes reachable from node and the corresponding edge weights"""
+        if self.backend == "dense":
+            row = self.adj_matrix[node]
+            targets = np.flatnonzero(row < NO_CONNECTION)
+            targets = targets[targets != node]
+            return targets, row[targets]
+        start, end = self.indptr[node], self.indptr[node + 1]
+        return self.indices[start:end], self.weights[start:end]
 
     def get_network_size(self) -> int:
         """Get network size"""
         return self.network_size
 
     def get_adjacency_matrix(self) -> np.ndarray:
-        """Get adjacency matrix"""
-        return self.adj_matrix.copy()
+        """Get adjacency matrix (built in O(n^2) memory for the sparse backend)"""
+        if self.backend == "dense":
+            return self.adj_matrix.copy()
+        matrix = np.full((self.network_size, self.network_size), NO_CONNECTION)
+        sources = np.repeat(np.arange(self.network_size), np.diff(self.indptr))
+        matrix[sources, self.indices] = self.weights
+        np.fill_diagonal(matrix, 0)
+        return matrix
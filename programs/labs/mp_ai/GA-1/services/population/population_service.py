@@ -1,5 +1,5 @@
-import random
-from typing import List, Tuple
+import numpy as np
+from typing import Optional, Tuple
 from services.network.network_service import NetworkService
 
 
@@ -10,6 +10,7 @@ class PopulationService:
         self.tournament_size = 3
         self.mutation_rate = 0.1
         self.crossover_rate = 0.9
+        self.rng = np.random.default_rng()
 
     def set_parameters(
         self,
@@ -24,60 +25,67 @@ class PopulationService:
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
 
-    def initialize_population(self, chromosome_length: int) -> List[List[int]]:
-        """Initialize random population"""
-        population = []
-        network_size = self.network_service.get_network_size()
+    def set_seed(self, seed: Optional[int] = None) -> None:
+        """Reset the random generator (None draws fresh OS entropy)"""
+        self.rng = np.random.default_rng(seed)
 
-        for _ in range(self.population_size):
-            chromosome = [
-                random.randint(0, network_size - 1) for _ in range(chromosome_length)
-            ]
-            population.append(chromosome)
-        return population
+    def initialize_population(self, chromosome_length: int) -> np.ndarray:
+        """Initialize random population as a (pop_size, chromosome_length) array"""
+        network_size = self.network_service.get_network_size()
+        return self.rng.integers(
+            0, network_size, size=(self.population_size, chromosome_length)
+        )
 
     def tournament_selection(
-        self, population: List[List[int]], fitness: List[float]
-    ) -> List[List[int]]:
-        """Perform tournament selection"""
-        selected = []
-        for _ in range(len(population)):
-            tournament = random.sample(
-                list(zip(population, fitness)), self.tournament_size
-            )
-            winner = max(tournament, key=lambda x: x[1])
-            selected.append(winner[0])
-        return selected
+        self, population: np.ndarray, fitness: np.ndarray
+    ) -> np.ndarray:
+        """Perform tournament selection for all slots at once
+
+        Contestants are drawn with replacement, so a tournament may contain
+        the same individual more than once.
+        """
+        size = len(population)
+        contestants = self.rng.integers(0, size, size=(size, self.tournament_size))
+        winners = np.argmax(fitness[contestants], axis=1)
+        return population[contestants[np.arange(size), winners]]
+
+    def crossover(self, parents: np.ndarray) -> np.ndarray:
+        """Perform single-point crossover on consecutive pairs of parents
 
-    def crossover(
-        self, parent1: List[int], parent2: List[int]
-    ) -> Tuple[List[int], List[int]]:
-        """Perform single-point crossover"""
-        if random.random() > self.crossover_rate:
-            return parent1, parent2
+        An odd last parent is passed through unchanged.
+        """
+        children = parents.copy()
+        pairs, length = len(parents) // 2, parents.shape[1]
+        if pairs == 0 or length < 2:
+            return children
 
-        point = random.randint(1, len(parent1) - 1)
-        child1 = parent1[:point] + parent2[point:]
-        child2 = parent2[:point] + parent1[point:]
-        return child1, child2
+        first = parents[0 : 2 * pairs : 2]
+        second = parents[1 : 2 * pairs : 2]
+        do_cross = self.rng.random(pairs) <= self.crossover_rate
+        points = self.rng.integers(1, length, size=pairs)
+        # Genes at and after the crossover point come from the other parent
+        swap = do_cross[:, None] & (np.arange(length) >= points[:, None])
+        children[0 : 2 * pairs : 2] = np.where(swap, second, first)
+        children[1 : 2 * pairs : 2] = np.where(swap, first, second)
+        return children
 
-    def mutate(self, chromosome: List[int]) -> List[int]:
-        """Perform mutation"""
+    def mutate(self, population: np.ndarray) -> np.ndarray:
+        """Replace each gene with a random node with probability mutation_rate"""
         network_size = self.network_service.get_network_size()
-        for i in range(len(chromosome)):
-            if random.random() < self.mutation_rate:
-                chromosome[i] = random.randint(0, network_size - 1)
-        return chromosome
+        mask = self.rng.random(population.shape) < self.mutation_rate
+        genes = self.rng.integers(0, network_size, size=population.shape)
+        return np.where(mask, genes, population)
 
     def reduce_population(
         self,
-        population: List[List[int]],
-        fitness: List[float],
-        new_population: List[List[int]],
-        new_fitness: List[float],
-    ) -> Tuple[List[List[int]], List[float]]:
+        population: np.ndarray,
+        fitness: np.ndarray,
+        new_population: np.ndarray,
+        new_fitness: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """Reduce population to maintain size"""
-        combined = list(zip(population + new_population, fitness + new_fitness))
-        combined.sort(key=lambda x: x[1], reverse=True)
-        best = combined[: self.population_size]
-        return [x[0] for x in best], [x[1] for x in best]
+        combined = np.concatenate([population, new_population])
+        combined_fitness = np.concatenate([fitness, new_fitness])
+        # Stable sort keeps earlier individuals first among equal fitness
+        best = np.argsort(-combined_fitness, kind="stable")[: self.population_size]
+        return combined[best], combined_fitness[best]
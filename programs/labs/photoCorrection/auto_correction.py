@@ -0,0 +1,95 @@
+import numpy as np
+
+import lut
+from histogram_stats import histogram_stats
+
+# Пороги диагностики (те же, что выводит ImageViewer.analyze_image)
+EXPOSURE_FRACTION = 0.3
+MIN_DYNAMIC_RANGE = 100
+MIN_UNIQUE_LEVELS = 100
+
+# Диапазон гаммы как у слайдера в интерфейсе
+GAMMA_RANGE = (0.1, 3.0)
+
+# Перцентили для границ линейного растяжения
+STRETCH_PERCENTILES = (0.005, 0.995)
+
+
+def diagnose(stats):
+    """Проблемы изображения по статистике его гистограммы"""
+    total = stats["total"]
+    # Порог диапазона задан в 8-битной шкале
+    min_range = MIN_DYNAMIC_RANGE * (stats["levels"] - 1) / 255
+    return {
+        "over_exposed": stats["light"] > EXPOSURE_FRACTION * total,
+        "under_exposed": stats["dark"] > EXPOSURE_FRACTION * total,
+        "low_contrast": stats["dynamic_range"] < min_range,
+        "posterized": stats["unique_levels"] < MIN_UNIQUE_LEVELS,
+    }
+
+
+def solve_gamma(median, levels=lut.LEVELS):
+    """Гамма, переводящая медиану гистограммы в середину диапазона"""
+    max_level = levels - 1
+    # Медиана на краю диапазона не решается, ограничиваем ее
+    x = np.clip(median, 1, max_level - 1) / max_level
+    gamma = np.log(0.5) / np.log(x)
+    return round(float(np.clip(gamma, *GAMMA_RANGE)), 2)
+
+
+def percentile_bounds(hist, low=STRETCH_PERCENTILES[0], high=STRETCH_PERCENTILES[1]):
+    """Уровни, ниже которых лежит заданная доля пикселей"""
+    cdf = np.cumsum(hist)
+    total = cdf[-1]
+    return (
+        int(np.searchsorted(cdf, low * total, side="right")),
+        int(np.searchsorted(cdf, high * total, side="left")),
+    )
+
+
+def auto_recipe(hist):
+    """Подбор рецепта коррекции только по гистограмме
+
+    Пере- и недоэкспонирование исправляются гаммой, центрирующей медиану,
+    низкий контраст - растяжением между перцентилями. Гистограмма после
+    гаммы получается переносом через LUT, так что проходов по пикселям нет.
+    Возвращает рецепт и список пояснений для пользователя.
+    """
+    recipe = {"basic": "none", "basic_params": {}, "hist": "none", "hist_params": {}}
+    notes = []
+
+    stats = histogram_stats(hist)
+    if stats["total"] == 0 or stats["all_black"] or stats["all_white"]:
+        return recipe, ["Автокоррекция невозможна: изображение однотонное"]
+
+    problems = diagnose(stats)
+
+    if problems["over_exposed"] or problems["under_exposed"]:
+        gamma = solve_gamma(stats["median"], stats["levels"])
+        if gamma != 1.0:
+            recipe["basic"] = "gamma"
+            recipe["basic_params"] = {"gamma": gamma}
+            hist = lut.remap_histogram(hist, lut.gamma_lut(gamma, stats["levels"]))
+            notes.append(
+                f"Гамма-коррекция γ = {gamma:.2f} "
+                f"(медиана {stats['median']} -> ~{stats['levels'] // 2})"
+            )
+
+    if problems["low_contrast"]:
+        low, high = percentile_bounds(hist)
+        if stats["levels"] != lut.LEVELS:
+            # Параметры рецепта задаются в 8-битной шкале
+            scale = 255 / (stats["levels"] - 1)
+            low, high = round(low * scale, 2), round(high * scale, 2)
+        if high > low:
+            recipe["hist"] = "stretch"
+            recipe["hist_params"] = {"low": low, "high": high}
+            notes.append(f"Линейное растяжение [{low}, {high}] -> [0, 255]")
+
+    if problems["posterized"]:
+        # Потерянные уровни поточечным преобразованием не восстановить
+        notes.append("Постеризация не исправляется градационной коррекцией")
+
+    if not notes:
+        notes.append("Коррекция не требуется")
+    return recipe, notes
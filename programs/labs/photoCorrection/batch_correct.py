@@ -0,0 +1,184 @@
+"""Пакетная градационная коррекция папки изображений без GUI
+
+Пример:
+    python batch_correct.py photos/ --recipe recipe_example.json --grayscale
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from PIL import Image
+
+import lut
+from auto_correction import auto_recipe
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tif", ".tiff")
+
+# Режимы, которые корректируются как есть; у RGBA и LA последний канал -
+# прозрачность, он переносится без изменений
+COLOR_MODES = ("RGB",)
+ALPHA_MODES = ("RGBA", "LA")
+
+
+def load_recipe(path):
+    """Чтение и проверка рецепта коррекции (формат как в lut.compile_recipe)"""
+    if path is None:
+        return {"basic": "none", "hist": "none"}
+
+    with open(path, encoding="utf-8") as f:
+        recipe = json.load(f)
+
+    if recipe.get("basic", "none") not in lut.BASIC_LUTS:
+        raise ValueError(f"Неизвестный базовый метод: {recipe['basic']}")
+    if recipe.get("hist", "none") not in lut.HISTOGRAM_METHODS:
+        raise ValueError(f"Неизвестный гистограммный метод: {recipe['hist']}")
+    return recipe
+
+
+def correct_file(source_path, output_path, recipe, grayscale):
+    """Коррекция одного файла; выполняется в процессе пула
+
+    recipe=None - автокоррекция: рецепт подбирается по гистограмме файла.
+    """
+    image = _supported_image(Image.open(source_path), grayscale, source_path)
+    img_array = lut.to_array(image)
+    # Коррекция идет только по цветовым каналам, без прозрачности
+    has_alpha = image.mode in ALPHA_MODES
+    bands = img_array[..., :-1] if has_alpha else img_array
+    if image.mode == "LA":
+        bands = bands[..., 0]
+    bands = np.ascontiguousarray(bands)
+
+    if recipe is None:
+        hist = lut.histogram(bands)
+        recipe, _ = auto_recipe(hist)
+    else:
+        hist = lut.histogram(bands) if lut.needs_histogram(recipe) else None
+    # bands - собственная копия, корректируем на месте
+    result, _ = lut.correct_array(bands, recipe, hist, out=bands)
+    if has_alpha:
+        img_array[..., :-1] = result.reshape(img_array[..., :-1].shape)
+        result = img_array
+    Image.fromarray(result).save(output_path)
+    return image.width * image.height
+
+
+def _supported_image(image, grayscale, path):
+    """Изображение в режиме, который умеет корректировать correct_file
+
+    Палитровые изображения переводятся в RGB (RGBA при прозрачности),
+    иначе таблица применилась бы к индексам палитры.
+    """
+    if image.mode in ("P", "PA"):
+        has_alpha = image.mode == "PA" or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    elif image.mode == "1":
+        image = image.convert("L")
+    if grayscale and image.mode not in lut.GRAY_MODES:
+        # 16-битные и float-изображения уже серые, convert("L") их бы урезал
+        image = image.convert("LA" if image.mode in ALPHA_MODES else "L")
+    if image.mode not in lut.GRAY_MODES + COLOR_MODES + ALPHA_MODES:
+        raise ValueError(f"Неподдерживаемый режим изображения {image.mode}: {path}")
+    return image
+
+
+def list_images(folder):
+    return sorted(
+        f
+        for f in os.listdir(folder)
+        if f.lower().endswith(IMAGE_EXTENSIONS)
+        and os.path.isfile(os.path.join(folder, f))
+    )
+
+
+def run_batch(folder, output_folder, recipe, grayscale=False, workers=None):
+    """Обработка папки в пуле процессов; результаты пишутся по мере готовности
+
+    recipe=None включает автокоррекцию.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    files = list_images(folder)
+
+    processed = 0
+    failed = 0
+    pixels = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                correct_file,
+                os.path.join(folder, filename),
+                os.path.join(output_folder, filename),
+                recipe,
+                grayscale,
+            ): filename
+            for filename in files
+        }
+        for future in as_completed(futures):
+            filename = futures[future]
+            try:
+                pixels += future.result()
+                processed += 1
+                print(f"Обработано: {filename}")
+            except Exception as e:
+                failed += 1
+                print(f"Ошибка при обработке файла {filename}: {e}")
+
+    elapsed = time.perf_counter() - start
+    return {
+        "processed": processed,
+        "failed": failed,
+        "megapixels": pixels / 1e6,
+        "seconds": elapsed,
+    }
+
+
+def print_summary(summary):
+    seconds = max(summary["seconds"], 1e-9)
+    print("\nИтог:")
+    print(f"• Обработано файлов: {summary['processed']}")
+    print(f"• Ошибок: {summary['failed']}")
+    print(f"• Время: {summary['seconds']:.2f} с")
+    print(f"• Производительность: {summary['processed'] / seconds:.1f} изобр./с")
+    print(f"• Производительность: {summary['megapixels'] / seconds:.1f} Мп/с")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетная коррекция изображений")
+    parser.add_argument("folder", help="Папка с исходными изображениями")
+    parser.add_argument(
+        "-o", "--output", help="Папка для результатов (по умолчанию folder/corrected)"
+    )
+    parser.add_argument("-r", "--recipe", help="JSON-файл рецепта коррекции")
+    parser.add_argument(
+        "-g",
+        "--grayscale",
+        action="store_true",
+        help="Перевести изображения в оттенки серого перед коррекцией",
+    )
+    parser.add_argument(
+        "-a",
+        "--auto",
+        action="store_true",
+        help="Автокоррекция по гистограмме каждого файла (вместо рецепта)",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="Число процессов"
+    )
+    args = parser.parse_args()
+
+    recipe = None if args.auto else load_recipe(args.recipe)
+    output_folder = args.output or os.path.join(args.folder, "corrected")
+    summary = run_batch(
+        args.folder, output_folder, recipe, args.grayscale, args.workers
+    )
+    print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
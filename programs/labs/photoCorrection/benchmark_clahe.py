@@ -0,0 +1,88 @@
+"""Сравнение скорости глобальной эквализации и CLAHE на разных размерах
+
+Тестовое изображение - градиент освещенности с шумом (как скан с неравномерной
+подсветкой), поэтому локальная эквализация здесь действительно нужна.
+
+Пример:
+    python benchmark_clahe.py --sizes 1 4 16 64 --repeat 3
+"""
+
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+import lut
+from clahe import clahe
+
+
+def make_test_image(megapixels, seed=0):
+    """Изображение с неравномерной подсветкой заданного размера"""
+    width = int(np.sqrt(megapixels * 1e6 * 4 / 3))
+    height = int(megapixels * 1e6 / width)
+    rng = np.random.default_rng(seed)
+    y = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+    x = np.linspace(0, 1, width, dtype=np.float32)[None, :]
+    img = 40 + 120 * x + 60 * y * y
+    img = img + rng.normal(0, 12, (height, width)).astype(np.float32)
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+def best_time(func, repeat):
+    """Лучшее время из repeat запусков, с"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(sizes, repeat=3, clip_limit=2.0, tile_grid=8, workers=None):
+    methods = {
+        "equalizeHist": lambda img: cv2.equalizeHist(img),
+        "equalize (LUT)": lambda img: cv2.LUT(
+            img, lut.equalize_lut(lut.histogram(img))
+        ),
+        "CLAHE": lambda img: clahe(img, clip_limit, tile_grid, min_pixels=np.inf),
+        "CLAHE (полосы)": lambda img: clahe(
+            img, clip_limit, tile_grid, max_workers=workers, min_pixels=0
+        ),
+    }
+
+    print(f"CLAHE: clip_limit={clip_limit}, сетка {tile_grid}x{tile_grid}")
+    print(f"Ядер: {os.cpu_count()}, потоков OpenCV: {cv2.getNumThreads()}")
+    header = f"{'Мп':>6} {'Размер':>12}" + "".join(f"{m:>18}" for m in methods)
+    print(header)
+    print("-" * len(header))
+
+    for megapixels in sizes:
+        img = make_test_image(megapixels)
+        row = f"{megapixels:>6g} {img.shape[1]:>5}x{img.shape[0]:<6}"
+        for method in methods.values():
+            seconds = best_time(lambda: method(img), repeat)
+            row += f"{seconds * 1000:>15.1f} мс"
+        print(row)
+    print("\nВремя - лучшее из запусков")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк CLAHE и эквализации")
+    parser.add_argument(
+        "--sizes", type=float, nargs="+", default=[1, 4, 16, 64], help="Размеры, Мп"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--clip-limit", type=float, default=2.0)
+    parser.add_argument("--tile-grid", type=int, default=8)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    run_benchmark(
+        args.sizes, args.repeat, args.clip_limit, args.tile_grid, args.workers
+    )
+
+
+if __name__ == "__main__":
+    main()
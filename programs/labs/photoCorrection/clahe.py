@@ -0,0 +1,87 @@
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+# Изображения меньше порога обрабатываются одним вызовом OpenCV
+PARALLEL_MIN_PIXELS = 16_000_000
+
+# Минимальная высота полосы в рядах плиток: ореол - по ряду сверху и снизу,
+# поэтому слишком узкие полосы тратят большую часть работы на ореол
+MIN_STRIP_TILE_ROWS = 4
+
+
+def clahe(
+    img_array,
+    clip_limit=2.0,
+    tile_grid=8,
+    max_workers=None,
+    min_pixels=PARALLEL_MIN_PIXELS,
+):
+    """Адаптивная эквализация гистограммы с ограничением контраста (CLAHE)
+
+    Большие изображения делятся на горизонтальные полосы из целых рядов
+    плиток, каждая полоса обрабатывается в своем потоке с ореолом в один
+    ряд плиток сверху и снизу. Пиксель интерполируется только между
+    соседними плитками, поэтому результат совпадает с обработкой целого
+    изображения с точностью до одного уровня: OpenCV считает веса
+    интерполяции во float32 от координаты внутри полосы.
+
+    Для uint16 OpenCV делит clip_limit на 65536 корзин вместо 256, поэтому
+    при том же clip_limit контраст усиливается слабее, чем для 8 бит.
+    """
+    tile_grid = int(tile_grid)
+    if img_array.ndim == 3:
+        # OpenCV CLAHE работает с одним каналом
+        return np.dstack(
+            [
+                clahe(img_array[..., i], clip_limit, tile_grid, max_workers, min_pixels)
+                for i in range(img_array.shape[2])
+            ]
+        )
+    img_array = np.ascontiguousarray(img_array)
+    height, width = img_array.shape[:2]
+
+    if height * width < min_pixels:
+        return cv2.createCLAHE(clip_limit, (tile_grid, tile_grid)).apply(img_array)
+
+    # Дополнение до кратного размера - так же, как это делает OpenCV
+    padded = img_array
+    if height % tile_grid or width % tile_grid:
+        padded = cv2.copyMakeBorder(
+            img_array,
+            0,
+            tile_grid - height % tile_grid,
+            0,
+            tile_grid - width % tile_grid,
+            cv2.BORDER_REFLECT_101,
+        )
+    tile_height = padded.shape[0] // tile_grid
+
+    workers = max_workers or os.cpu_count() or 1
+    rows_per_strip = max(MIN_STRIP_TILE_ROWS, math.ceil(tile_grid / workers))
+    strips = [
+        (r0, min(r0 + rows_per_strip, tile_grid))
+        for r0 in range(0, tile_grid, rows_per_strip)
+    ]
+
+    output = np.empty_like(img_array)
+
+    def process(strip):
+        r0, r1 = strip
+        # Ряды плиток с ореолом
+        h0, h1 = max(r0 - 1, 0), min(r1 + 1, tile_grid)
+        sub = padded[h0 * tile_height : h1 * tile_height]
+        result = cv2.createCLAHE(clip_limit, (tile_grid, h1 - h0)).apply(sub)
+
+        y0 = r0 * tile_height
+        y1 = min(r1 * tile_height, height)
+        if y1 > y0:
+            local = y0 - h0 * tile_height
+            output[y0:y1] = result[local : local + (y1 - y0), :width]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(process, strips))
+    return output
@@ -1,32 +1,146 @@
-from PIL import Image
+"""Перевод изображений папки в оттенки серого с префиксом bw_
+
+Повторный запуск пропускает файлы, у которых bw_-копия свежее исходника:
+размер и время изменения исходников хранятся в небольшом манифесте.
+
+Пример:
+    python converter_to_BW.py photos/ --max-size 1600
+"""
+
+import argparse
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+# Путь к папке с изображениями (относительно этого файла, а не текущей папки)
+DEFAULT_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "photos")
+
+MANIFEST_NAME = ".bw_manifest.json"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tif", ".tiff")
+
+# Серые режимы PIL сохраняются как есть: convert("L") урезал бы 16 бит
+GRAY_MODES = ("L", "I", "I;16", "I;16B", "I;16L", "F")
+
+
+def load_manifest(folder):
+    path = os.path.join(folder, MANIFEST_NAME)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(folder, manifest):
+    path = os.path.join(folder, MANIFEST_NAME)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+def source_signature(path, max_size):
+    stat = os.stat(path)
+    return {"mtime": stat.st_mtime, "size": stat.st_size, "max_size": max_size}
+
+
+def is_up_to_date(source_path, output_path, signature, manifest_entry):
+    """bw_-копия есть, свежее исходника и сделана из той же его версии"""
+    if manifest_entry != signature or not os.path.exists(output_path):
+        return False
+    return os.path.getmtime(output_path) >= os.path.getmtime(source_path)
+
+
+def load_grayscale(path, max_size=None):
+    """Открытие изображения в оттенках серого
+
+    Для JPEG при заданном max_size используется draft-режим: декодер сразу
+    выдает яркостный канал в уменьшенном масштабе (1/2, 1/4, 1/8).
+    """
+    image = Image.open(path)
+    if max_size:
+        image.draft("L", (max_size, max_size))
+
+    # Конвертируем в ЧБ (grayscale)
+    bw_image = image if image.mode in GRAY_MODES else image.convert("L")
+    if max_size:
+        bw_image.thumbnail((max_size, max_size), Image.LANCZOS)
+    return bw_image
+
+
+def convert_image(source_path, output_path, max_size=None):
+    load_grayscale(source_path, max_size).save(output_path)
+
+
+def convert_folder(folder=DEFAULT_FOLDER, workers=None, max_size=None, force=False):
+    """Инкрементальная конвертация папки в пуле потоков
+
+    Возвращает число сконвертированных, пропущенных и ошибочных файлов.
+    """
+    manifest = {} if force else load_manifest(folder)
+
+    tasks = []
+    skipped = 0
+    for filename in sorted(os.listdir(folder)):
+        # Пропускаем файлы, которые уже начинаются с bw_
+        if filename.startswith("bw_"):
+            continue
+        if not filename.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+
+        source_path = os.path.join(folder, filename)
+        # Формируем новое имя файла с префиксом bw_
+        output_path = os.path.join(folder, "bw_" + filename)
+        signature = source_signature(source_path, max_size)
+        if is_up_to_date(source_path, output_path, signature, manifest.get(filename)):
+            skipped += 1
+            continue
+        tasks.append((filename, source_path, output_path, signature))
 
-# Путь к папке с изображениями
-folder_path = "programs/labs/photoCorrection/photos/"
+    converted = 0
+    failed = 0
+    # Декодирование и кодирование в PIL отпускают GIL, потоков достаточно
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            (task, pool.submit(convert_image, task[1], task[2], max_size))
+            for task in tasks
+        ]
+        for (filename, _, output_path, signature), future in futures:
+            try:
+                future.result()
+                manifest[filename] = signature
+                converted += 1
+                print(f"Обработано: {filename} -> {os.path.basename(output_path)}")
+            except Exception as e:
+                manifest.pop(filename, None)
+                failed += 1
+                print(f"Ошибка при обработке файла {filename}: {e}")
 
-# Проходим по всем файлам в папке
-for filename in os.listdir(folder_path):
-    # Пропускаем файлы, которые уже начинаются с bw_
-    if filename.startswith("bw_"):
-        continue
+    save_manifest(folder, manifest)
+    return {"converted": converted, "skipped": skipped, "failed": failed}
 
-    # Проверяем, что это файл изображения (можно добавить другие расширения)
-    if filename.lower().endswith((".png", ".jpg", ".jpeg", ".bmp", ".gif")):
-        try:
-            # Открываем изображение
-            image_path = os.path.join(folder_path, filename)
-            image = Image.open(image_path)
 
-            # Конвертируем в ЧБ (grayscale)
-            bw_image = image.convert("L")
+def main():
+    parser = argparse.ArgumentParser(description="Перевод изображений в оттенки серого")
+    parser.add_argument("folder", nargs="?", default=DEFAULT_FOLDER)
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=None,
+        help="Максимальная сторона результата (ускоряет декодирование JPEG)",
+    )
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument(
+        "-f", "--force", action="store_true", help="Конвертировать все файлы заново"
+    )
+    args = parser.parse_args()
 
-            # Формируем новое имя файла с префиксом bw_
-            new_filename = "bw_" + filename
-            new_path = os.path.join(folder_path, new_filename)
+    result = convert_folder(args.folder, args.workers, args.max_size, args.force)
+    print(
+        f"Сконвертировано: {result['converted']}, "
+        f"пропущено: {result['skipped']}, ошибок: {result['failed']}"
+    )
 
-            # Сохраняем результат
-            bw_image.save(new_path)
-            print(f"Обработано: {filename} -> {new_filename}")
 
-        except Exception as e:
-            print(f"Ошибка при обработке файла {filename}: {e}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class CorrectionScheduler:
+    """Планировщик коррекции для событий слайдеров
+
+    Серия событий за delay_ms объединяется в один запрос с последними
+    параметрами. Расчет выполняется в фоновом потоке, одновременно считается
+    не более одного запроса, а в интерфейс выводится только результат
+    самого нового запроса - устаревшие результаты отбрасываются.
+
+    compute(*args) вызывается в фоновом потоке и не должен трогать Tk,
+    render(result) вызывается в потоке Tk.
+    """
+
+    POLL_MS = 15
+
+    def __init__(self, root, compute, render, delay_ms=40):
+        self.root = root
+        self.compute = compute
+        self.render = render
+        self.delay_ms = delay_ms
+
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.after_id = None
+        self.running = None
+        self.generation = 0
+        self.latest_args = None
+
+    def request(self, *args, delay_ms=None):
+        """Новый запрос заменяет все еще не начатые"""
+        self.generation += 1
+        self.latest_args = args
+
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+        delay = self.delay_ms if delay_ms is None else delay_ms
+        self.after_id = self.root.after(delay, self._submit)
+
+    def _submit(self):
+        self.after_id = None
+        if self.running is not None:
+            # Поток занят - последний запрос будет запущен по его завершении
+            return
+
+        generation = self.generation
+        self.running = self.executor.submit(self.compute, *self.latest_args)
+        self.root.after(self.POLL_MS, self._poll, self.running, generation)
+
+    def _poll(self, future, generation):
+        if not future.done():
+            self.root.after(self.POLL_MS, self._poll, future, generation)
+            return
+
+        self.running = None
+        if generation != self.generation:
+            # Пока шел расчет, пришли новые параметры
+            if self.after_id is None:
+                self._submit()
+            return
+
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Ошибка при коррекции изображения: {e}")
+            return
+        self.render(result)
+
+    def shutdown(self):
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,64 @@
+import functools
+import numpy as np
+from PIL import Image
+
+from lut import GRAY_MODES, LEVELS, _frozen, _scale_axis, histogram, lut_dtype, to_array
+
+# Приведение гистограммы к заданному распределению (histogram specification):
+# уровень x переходит в наименьший z, для которого G(z) >= F(x), где F - CDF
+# исходного изображения, а G - целевая CDF. Обе CDF имеют по одному значению
+# на уровень (256 или 65536), поэтому построение LUT не зависит от размера
+# изображения. Параметры распределений заданы в 8-битной шкале 0..255.
+
+
+def histogram_cdf(hist):
+    """Нормированная CDF по гистограмме"""
+    cdf = np.cumsum(hist, dtype=np.float64)
+    return cdf / cdf[-1] if cdf[-1] > 0 else cdf
+
+
+@functools.lru_cache(maxsize=256)
+def gaussian_target_cdf(mean=128, std=50, levels=LEVELS):
+    """CDF дискретного гауссова распределения на уровнях 0..levels-1"""
+    x = _scale_axis(levels)
+    target_hist = np.exp(-((x - mean) ** 2) / (2 * std**2))
+    return _frozen(histogram_cdf(target_hist))
+
+
+@functools.lru_cache(maxsize=256)
+def exponential_target_cdf(lambda_param=0.05, levels=LEVELS):
+    """CDF дискретного экспоненциального распределения на уровнях 0..levels-1"""
+    x = _scale_axis(levels)
+    target_hist = lambda_param * np.exp(-lambda_param * x)
+    return _frozen(histogram_cdf(target_hist))
+
+
+@functools.lru_cache(maxsize=16)
+def _reference_cdf(path):
+    """CDF эталона в его собственной глубине (256 или 65536 уровней)"""
+    with Image.open(path) as image:
+        if image.mode not in GRAY_MODES:
+            image = image.convert("L")
+        hist = histogram(to_array(image))
+    return _frozen(histogram_cdf(hist))
+
+
+@functools.lru_cache(maxsize=16)
+def reference_target_cdf(path, levels=LEVELS):
+    """CDF эталонного изображения на levels уровнях (читается один раз на путь)"""
+    cdf = _reference_cdf(path)
+    ref_levels = len(cdf)
+    if ref_levels == levels:
+        return cdf
+    # Ближайший уровень эталона для каждого уровня целевой шкалы
+    index = (np.arange(levels) * (ref_levels - 1) + (levels - 1) // 2) // (levels - 1)
+    return _frozen(cdf[index])
+
+
+def match_lut(source_hist, target_cdf):
+    """LUT, переводящая гистограмму source_hist в распределение target_cdf"""
+    max_level = len(source_hist) - 1
+    source_cdf = histogram_cdf(source_hist)
+    lut = np.searchsorted(target_cdf, source_cdf, side="left")
+    # Из-за округления F(max) может оказаться чуть больше G(max)
+    return np.minimum(lut, max_level).astype(lut_dtype(max_level + 1))
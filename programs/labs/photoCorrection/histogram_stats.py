@@ -0,0 +1,47 @@
+import numpy as np
+
+# Границы теней и светов в долях от максимального уровня
+DARK_FRACTION = 0.1
+LIGHT_FRACTION = 0.9
+
+
+def histogram_stats(hist):
+    """Статистика изображения, вычисленная только по его гистограмме
+
+    Для коррекций через LUT гистограмма результата получается точно
+    (lut.remap_histogram), поэтому проход по пикселям не нужен.
+    """
+    hist = np.asarray(hist)
+    levels = len(hist)
+    max_level = levels - 1
+    total = int(hist.sum())
+
+    dark_threshold = int(DARK_FRACTION * max_level)
+    light_threshold = int(LIGHT_FRACTION * max_level)
+
+    present = np.flatnonzero(hist)
+    low = int(present[0]) if present.size else 0
+    high = int(present[-1]) if present.size else 0
+
+    cdf = np.cumsum(hist)
+    median = int(np.searchsorted(cdf, total / 2)) if total else 0
+    mean = float(np.dot(np.arange(levels), hist) / total) if total else 0.0
+
+    return {
+        "levels": levels,
+        "depth": int(np.log2(levels)),
+        "total": total,
+        "dark_threshold": dark_threshold,
+        "light_threshold": light_threshold,
+        "dark": int(hist[:dark_threshold].sum()),
+        "mid": int(hist[dark_threshold:light_threshold].sum()),
+        "light": int(hist[light_threshold:].sum()),
+        "min": low,
+        "max": high,
+        "dynamic_range": high - low,
+        "unique_levels": int(present.size),
+        "median": median,
+        "mean": mean,
+        "all_black": total > 0 and hist[0] == total,
+        "all_white": total > 0 and hist[max_level] == total,
+    }
@@ -0,0 +1,395 @@
+import functools
+import cv2
+import numpy as np
+from PIL import Image
+
+from clahe import clahe
+
+# Все преобразования ImageCorrector - поточечные отображения яркости,
+# поэтому любое из них (и их цепочка) описывается таблицей значений:
+# 256 для 8-битных изображений и 65536 для 16-битных. Параметры методов
+# (c, порог, μ, σ, границы растяжения) всегда задаются в 8-битной шкале
+# 0..255 и пересчитываются под глубину изображения.
+LEVELS = 256
+LEVELS_16 = 65536
+
+# Float-изображения (яркость 0..1) корректируются 16-битной кривой
+# с линейной интерполяцией между ее узлами
+FLOAT_LEVELS = LEVELS_16
+
+# Пикселей за раз при обработке float-изображений (ограничивает
+# размер временных массивов)
+FLOAT_CHUNK_PIXELS = 1 << 20
+
+# Режимы PIL, которые уже являются оттенками серого
+GRAY_MODES = ("L", "I", "I;16", "I;16B", "I;16L", "F")
+
+
+def levels_for(dtype):
+    """Число уровней таблицы для типа изображения"""
+    dtype = np.dtype(dtype)
+    if dtype == np.uint8:
+        return LEVELS
+    if dtype == np.uint16:
+        return LEVELS_16
+    if np.issubdtype(dtype, np.floating):
+        return FLOAT_LEVELS
+    raise TypeError(f"Неподдерживаемый тип изображения: {dtype}")
+
+
+def lut_dtype(levels):
+    return np.uint8 if levels <= LEVELS else np.uint16
+
+
+def to_array(image):
+    """Массив изображения в родной глубине: uint8, uint16 или float32
+
+    PIL открывает 16-битные PNG в режиме "I" (int32), такие массивы
+    приводятся к uint16. Возвращается собственная копия, поэтому ее
+    можно корректировать на месте.
+    """
+    if not isinstance(image, Image.Image):
+        return np.array(image)
+    if image.mode == "I":
+        return np.clip(np.asarray(image), 0, LEVELS_16 - 1).astype(np.uint16)
+    if image.mode.startswith("I;16"):
+        return np.asarray(image).astype(np.uint16)
+    if image.mode == "F":
+        return np.array(image, dtype=np.float32)
+    return np.array(image)
+
+
+def to_uint8(img_array):
+    """8-битная копия для отображения"""
+    if img_array.dtype == np.uint8:
+        return img_array
+    if img_array.dtype == np.uint16:
+        return cv2.convertScaleAbs(img_array, alpha=255 / (LEVELS_16 - 1))
+    return cv2.convertScaleAbs(img_array, alpha=255)
+
+
+def quantize_float(img_array):
+    """Float-изображение 0..1 -> уровни 16-битной шкалы"""
+    levels = np.clip(img_array, 0, 1) * np.float32(FLOAT_LEVELS - 1)
+    return np.rint(levels).astype(np.uint16)
+
+
+def _frozen(lut):
+    """Таблицы кэшируются, поэтому защищаем их от изменения"""
+    lut.flags.writeable = False
+    return lut
+
+
+def _scale_axis(levels):
+    """Уровни 0..levels-1 в 8-битной шкале, в которой заданы параметры"""
+    return np.arange(levels, dtype=float) * (255 / (levels - 1))
+
+
+def _to_levels(y, levels, rounding=np.floor):
+    """Кривая в 8-битной шкале -> таблица на levels уровней"""
+    y = np.clip(y * ((levels - 1) / 255), 0, levels - 1)
+    return _frozen(rounding(y).astype(lut_dtype(levels)))
+
+
+@functools.lru_cache(maxsize=None)
+def identity_lut(levels=LEVELS):
+    return _frozen(np.arange(levels, dtype=lut_dtype(levels)))
+
+
+@functools.lru_cache(maxsize=None)
+def polarity_lut(levels=LEVELS):
+    """Инверсия (полярность): 255 - x"""
+    return _frozen(levels - 1 - np.arange(levels, dtype=lut_dtype(levels)))
+
+
+@functools.lru_cache(maxsize=256)
+def logarithmic_lut(c=45, levels=LEVELS):
+    """Логарифмическое преобразование: c·ln(1 + x)"""
+    return _to_levels(c * np.log(1 + _scale_axis(levels)), levels)
+
+
+@functools.lru_cache(maxsize=256)
+def gamma_lut(gamma=1.0, levels=LEVELS):
+    """Степенное преобразование: 255·(x/255)^γ (как skimage.exposure.adjust_gamma)"""
+    lut = (levels - 1) * (np.linspace(0, 1, levels) ** gamma)
+    return _frozen(np.minimum(np.rint(lut), levels - 1).astype(lut_dtype(levels)))
+
+
+@functools.lru_cache(maxsize=256)
+def piecewise_linear_lut(threshold=128, slope_low=0.5, slope_high=1.5, levels=LEVELS):
+    """Кусочно-линейное преобразование с порогом threshold"""
+    x = _scale_axis(levels)
+    y = np.where(x < threshold, slope_low * x, threshold + slope_high * (x - threshold))
+    return _to_levels(y, levels)
+
+
+# histogram_matching сам импортирует из lut константы и чтение изображений,
+# поэтому функции приведения гистограмм импортируются при вызове
+def gaussian_mapping_lut(hist, mean=128, std=50):
+    """Приведение гистограммы к гауссову распределению"""
+    from histogram_matching import gaussian_target_cdf, match_lut
+
+    return match_lut(hist, gaussian_target_cdf(mean, std, len(hist)))
+
+
+def exponential_mapping_lut(hist, lambda_param=0.05):
+    """Приведение гистограммы к экспоненциальному распределению"""
+    from histogram_matching import exponential_target_cdf, match_lut
+
+    return match_lut(hist, exponential_target_cdf(lambda_param, len(hist)))
+
+
+def reference_mapping_lut(hist, reference):
+    """Приведение гистограммы к гистограмме эталонного изображения"""
+    from histogram_matching import match_lut, reference_target_cdf
+
+    return match_lut(hist, reference_target_cdf(reference, len(hist)))
+
+
+@functools.lru_cache(maxsize=256)
+def stretch_lut(low=0, high=255, levels=LEVELS):
+    """Линейное растяжение [low, high] -> [0, 255] с отсечением краев"""
+    scale = 255.0 / (high - low) if high > low else 0.0
+    y = (_scale_axis(levels) - low) * scale
+    return _to_levels(y, levels, np.rint)
+
+
+def _float_type(levels):
+    # Для 8 бит OpenCV считает во float32, повторяем для побитового
+    # совпадения; 16-битным суммам точности float32 не хватает
+    return np.float32 if levels == LEVELS else np.float64
+
+
+def normalize_lut(hist):
+    """Линейное растяжение [min, max] -> [0, 255] (как cv2.normalize NORM_MINMAX)"""
+    levels = len(hist)
+    present = np.flatnonzero(hist)
+    if present.size == 0:
+        return identity_lut(levels)
+    low, high = present[0], present[-1]
+    scale = (levels - 1) / (high - low) if high > low else 0.0
+    # convertTo в OpenCV считает y = x·scale + shift через FMA во float32:
+    # произведение не округляется отдельно, округляется только сумма, и
+    # уже она - до ближайшего четного. Произведение float32 на уровень
+    # точно представимо во float64, поэтому FMA повторяется так
+    f32 = np.float32
+    y = np.arange(levels, dtype=np.float64) * np.float64(f32(scale))
+    y += np.float64(f32(-low * scale))
+    y = np.rint(y.astype(f32))
+    return np.clip(y, 0, levels - 1).astype(lut_dtype(levels))
+
+
+def verify_normalize_lut():
+    """Сравнение normalize_lut с cv2.normalize на всех 8-битных диапазонах
+
+    Изображение - ступенька low..high, поэтому проверяются все уровни, в
+    том числе попадающие ровно на .5 (диапазон 0..6) и почти на .5
+    (диапазон 15..145). Возвращает число диапазонов с расхождением.
+    """
+    mismatches = 0
+    for low in range(LEVELS - 1):
+        for high in range(low + 1, LEVELS):
+            img = np.arange(low, high + 1, dtype=np.uint8).reshape(1, -1)
+            expected = cv2.normalize(img, None, 0, LEVELS - 1, cv2.NORM_MINMAX)
+            hist = np.bincount(img.ravel(), minlength=LEVELS)
+            if not np.array_equal(normalize_lut(hist)[img], expected):
+                mismatches += 1
+    return mismatches
+
+
+def equalize_lut(hist):
+    """Эквализация гистограммы (как cv2.equalizeHist)"""
+    hist = np.asarray(hist, dtype=np.int64)
+    levels = len(hist)
+    total = int(hist.sum())
+    present = np.flatnonzero(hist)
+    if present.size == 0:
+        return identity_lut(levels)
+
+    first = present[0]
+    if hist[first] == total:
+        return np.full(levels, first, dtype=lut_dtype(levels))
+
+    ftype = _float_type(levels)
+    scale = ftype(levels - 1) / ftype(total - hist[first])
+    y = (np.cumsum(hist) - hist[first]).astype(ftype) * scale
+    y[: first + 1] = 0
+    return np.clip(np.rint(y), 0, levels - 1).astype(lut_dtype(levels))
+
+
+# Таблицы базовых преобразований зависят только от параметров
+BASIC_LUTS = {
+    "none": identity_lut,
+    "polarity": polarity_lut,
+    "logarithmic": logarithmic_lut,
+    "gamma": gamma_lut,
+    "piecewise_linear": piecewise_linear_lut,
+}
+
+# Гистограммные преобразования; часть из них строится по гистограмме
+HISTOGRAM_LUTS = {
+    "none": identity_lut,
+    "normalize": normalize_lut,
+    "equalize": equalize_lut,
+    "stretch": stretch_lut,
+    "gaussian_mapping": gaussian_mapping_lut,
+    "exponential_mapping": exponential_mapping_lut,
+    "reference_mapping": reference_mapping_lut,
+}
+HISTOGRAM_DEPENDENT = {
+    "normalize",
+    "equalize",
+    "gaussian_mapping",
+    "exponential_mapping",
+    "reference_mapping",
+}
+
+# Локальные методы не сводятся к одной LUT: результат зависит от окрестности
+# пикселя, поэтому они выполняются отдельным шагом после базовой LUT
+LOCAL_METHODS = {
+    "clahe": clahe,
+}
+HISTOGRAM_METHODS = set(HISTOGRAM_LUTS) | set(LOCAL_METHODS)
+
+
+def histogram(img_array):
+    """Гистограмма изображения: 256 уровней для 8 бит, 65536 - для 16 бит и float"""
+    # Гистограмма не меняет массив, поэтому копия to_array не нужна
+    if isinstance(img_array, Image.Image):
+        img_array = to_array(img_array)
+    img_array = np.asarray(img_array)
+    levels = levels_for(img_array.dtype)
+    if np.issubdtype(img_array.dtype, np.floating):
+        img_array = quantize_float(img_array)
+    return np.bincount(img_array.ravel(), minlength=levels)
+
+
+def reduce_histogram(hist, levels=LEVELS):
+    """Гистограмма с меньшим числом уровней (для графиков)"""
+    hist = np.asarray(hist)
+    if len(hist) == levels:
+        return hist
+    return hist.reshape(levels, -1).sum(axis=1)
+
+
+def remap_histogram(hist, lut):
+    """Точная гистограмма изображения после применения LUT"""
+    return np.bincount(lut, weights=hist, minlength=len(hist)).astype(np.int64)
+
+
+def compose(*luts):
+    """Композиция таблиц: сначала первая, затем следующие"""
+    result = luts[0]
+    for lut in luts[1:]:
+        result = lut[result]
+    return result
+
+
+def needs_histogram(recipe):
+    return recipe.get("hist", "none") in HISTOGRAM_DEPENDENT
+
+
+def compile_recipe(recipe, hist=None, levels=LEVELS):
+    """Сборка одной LUT из рецепта коррекции
+
+    Рецепт: {"basic": метод, "basic_params": {...},
+             "hist": метод, "hist_params": {...}}.
+    Для гистограммных методов нужна гистограмма исходного изображения;
+    число уровней таблицы берется из нее или из levels.
+    Локальные методы (LOCAL_METHODS) в LUT не входят, см. correct_array.
+    """
+    basic = recipe.get("basic", "none")
+    hist_method = recipe.get("hist", "none")
+    if hist is not None:
+        levels = len(hist)
+
+    basic_lut = BASIC_LUTS[basic](**recipe.get("basic_params", {}), levels=levels)
+
+    if hist_method in HISTOGRAM_DEPENDENT:
+        if hist is None:
+            raise ValueError(f"Для метода {hist_method} нужна гистограмма")
+        # Гистограмма после базового преобразования - без прохода по пикселям
+        hist_lut = HISTOGRAM_LUTS[hist_method](
+            remap_histogram(hist, basic_lut), **recipe.get("hist_params", {})
+        )
+    elif hist_method in LOCAL_METHODS:
+        hist_lut = identity_lut(levels)
+    else:
+        hist_lut = HISTOGRAM_LUTS[hist_method](
+            **recipe.get("hist_params", {}), levels=levels
+        )
+
+    return compose(basic_lut, hist_lut)
+
+
+def _apply_float_lut(img_array, lut, out):
+    """LUT для float-изображения: линейная интерполяция между узлами во float32"""
+    if out is None:
+        out = np.empty(img_array.shape, dtype=np.float32)
+    max_level = len(lut) - 1
+    values = lut.astype(np.float32) / np.float32(max_level)
+
+    source = img_array.reshape(-1)
+    target = out.reshape(-1)
+    for start in range(0, source.size, FLOAT_CHUNK_PIXELS):
+        chunk = source[start : start + FLOAT_CHUNK_PIXELS]
+        pos = np.multiply(chunk, max_level, dtype=np.float32)
+        np.clip(pos, 0, max_level, out=pos)
+        index = pos.astype(np.int32)
+        np.minimum(index, max_level - 1, out=index)
+        pos -= index  # дробная часть
+        low = values[index]
+        high = values[index + 1]
+        high -= low
+        high *= pos
+        np.add(low, high, out=target[start : start + FLOAT_CHUNK_PIXELS])
+    return out
+
+
+def apply_lut_array(img_array, lut, out=None):
+    """Применение LUT к массиву; out=img_array - коррекция на месте
+
+    out должен быть непрерывным массивом того же размера.
+    """
+    if img_array.dtype == np.uint8:
+        return cv2.LUT(img_array, lut, dst=out)
+    if img_array.dtype == np.uint16:
+        # mode="clip" не буферизует out, индексы и так в диапазоне
+        return np.take(lut, img_array, out=out, mode="clip")
+    return _apply_float_lut(img_array, lut, out)
+
+
+def apply_lut(image, lut):
+    """Применение LUT к изображению за один проход"""
+    return Image.fromarray(apply_lut_array(to_array(image), lut))
+
+
+def _apply_local(img_array, method, params):
+    if np.issubdtype(img_array.dtype, np.floating):
+        # OpenCV CLAHE работает только с целыми типами
+        result = method(quantize_float(img_array), **params)
+        return result.astype(np.float32) / np.float32(FLOAT_LEVELS - 1)
+    return method(img_array, **params)
+
+
+def correct_array(img_array, recipe, hist=None, correction_lut=None, out=None):
+    """Применение рецепта к массиву uint8, uint16 или float32
+
+    Возвращает результат и его гистограмму. Для LUT-рецептов гистограмма
+    переносится через таблицу; после локального метода ее приходится
+    считать по пикселям результата. Уже собранную LUT рецепта можно
+    передать в correction_lut, буфер результата - в out.
+    """
+    if correction_lut is None:
+        correction_lut = compile_recipe(recipe, hist, levels_for(img_array.dtype))
+    result = apply_lut_array(img_array, correction_lut, out)
+
+    hist_method = recipe.get("hist", "none")
+    if hist_method in LOCAL_METHODS:
+        result = _apply_local(
+            result, LOCAL_METHODS[hist_method], recipe.get("hist_params", {})
+        )
+        return result, histogram(result)
+
+    result_hist = remap_histogram(hist, correction_lut) if hist is not None else None
+    return result, result_hist
@@ -15,13 +15,31 @@ from tkinter import (
     ttk,
     LabelFrame,
 )
-from skimage import exposure
 import cv2
 from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
 from matplotlib.figure import Figure
 
+import lut
+from histogram_stats import histogram_stats
+from correction_scheduler import CorrectionScheduler
+from auto_correction import auto_recipe, diagnose
+
 
 class FunctionVisualizer(tk.Toplevel):
+    # Заголовок и цвет кривой для каждого метода
+    METHOD_STYLES = {
+        "none": ("Линейное преобразование", "#2c3e50"),
+        "logarithmic": ("Логарифмическое преобразование", "#2980b9"),
+        "power": ("Степенное преобразование", "#27ae60"),
+        "piecewise": ("Кусочно-линейное преобразование", "#c0392b"),
+        "normalize": ("Нормализация", "#16a085"),
+        "equalize": ("Эквализация", "#16a085"),
+        "clahe": ("Адаптивная эквализация (CLAHE)", "#16a085"),
+        "gaussian": ("Гауссово распределение", "#8e44ad"),
+        "exponential": ("Экспоненциальное распределение", "#d35400"),
+        "reference": ("Приведение к эталонному изображению", "#7f8c8d"),
+    }
+
     def __init__(self, parent):
         super().__init__(parent)
         self.title("Визуализация функции преобразования")
@@ -37,124 +55,134 @@ class FunctionVisualizer(tk.Toplevel):
         self.ax.set_facecolor("#f8f9fa")  # Светлый фон для графика
         self.fig.patch.set_facecolor("#ffffff")  # Белый фон для фигуры
 
+        # Настройка осей (один раз: при смене параметров не меняются)
+        label_font = {"fontsize": 12, "color": "#2c3e50"}
+        self.ax.set_xlabel("Входное значение", **label_font)
+        self.ax.set_ylabel("Выходное значение", **label_font)
+        self.ax.set_xlim(0, 255)
+        self.ax.set_ylim(0, 255)
+
+        # Постоянные объекты графика; animated=True - они рисуются только
+        # через блиттинг поверх сохраненного фона
+        self.x = np.arange(lut.LEVELS)
+        (self.curve,) = self.ax.plot(
+            self.x, self.x, linewidth=2, label="Преобразование (LUT)", animated=True
+        )
+        (self.target_line,) = self.ax.plot(
+            self.x,
+            self.x,
+            linewidth=1.5,
+            linestyle="--",
+            label="Целевое распределение",
+            animated=True,
+            visible=False,
+        )
+        self.formula_text = self.ax.text(
+            0.98,
+            0.02,
+            "",
+            transform=self.ax.transAxes,
+            bbox=dict(
+                facecolor="white",
+                alpha=0.8,
+                edgecolor="#bdc3c7",
+                boxstyle="round,pad=0.5",
+            ),
+            ha="right",
+            va="bottom",
+            fontsize=12,
+            color="#2c3e50",
+            animated=True,
+        )
+
         # Создаем холст для отображения графика
         self.canvas = FigureCanvasTkAgg(self.fig, master=self)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+        # Фон без анимированных объектов; обновляется при каждой полной
+        # перерисовке (смена метода, изменение размера окна, масштаб)
+        self.background = None
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+
         # Добавляем панель инструментов
         self.toolbar = NavigationToolbar2Tk(self.canvas, self)
         self.toolbar.update()
 
         # Инициализируем график
+        self.method = None
         self.update_plot("none")
 
-    def update_plot(self, method, **params):
-        """Обновление графика в зависимости от выбранного метода"""
-        self.ax.clear()
-        x = np.linspace(0, 255, 256)
-
-        # Настройка стиля для всех графиков
-        self.ax.grid(True, linestyle="--", alpha=0.7)
-        self.ax.set_facecolor("#f8f9fa")
-
-        # Настройка шрифтов
-        title_font = {"fontsize": 16, "fontweight": "bold", "color": "#2c3e50"}
-        label_font = {"fontsize": 12, "color": "#2c3e50"}
-        legend_font = {"size": 11}
-
-        if method == "logarithmic":
-            c = params.get("c", 45)
-            y = c * np.log(1 + x)
-            self.ax.plot(x, y, color="#2980b9", linewidth=2, label=f"c = {c}")
-            self.ax.set_title("Логарифмическое преобразование", **title_font)
-
-        elif method == "power":
-            gamma = params.get("gamma", 1.0)
-            y = 255 * (x / 255) ** gamma
-            self.ax.plot(x, y, color="#27ae60", linewidth=2, label=f"γ = {gamma:.1f}")
-            self.ax.set_title("Степенное преобразование", **title_font)
-
-        elif method == "piecewise":
-            threshold = params.get("threshold", 128)
-            slope_low = params.get("slope_low", 0.5)
-            slope_high = params.get("slope_high", 1.5)
-
-            y = np.piecewise(
-                x,
-                [x < threshold, x >= threshold],
-                [
-                    lambda x: slope_low * x,
-                    lambda x: slope_low * threshold + slope_high * (x - threshold),
-                ],
-            )
+    def set_method(self, method):
+        """Смена метода: заголовок, цвет и легенда - с полной перерисовкой"""
+        self.method = method
+        title, color = self.METHOD_STYLES.get(method, self.METHOD_STYLES["none"])
+        self.ax.set_title(title, fontsize=16, fontweight="bold", color="#2c3e50")
+        self.curve.set_color(color)
+        self.target_line.set_color(color)
+        self.target_line.set_visible(method in ("gaussian", "exponential"))
+
+        handles = [self.curve]
+        if self.target_line.get_visible():
+            handles.append(self.target_line)
+        self.ax.legend(
+            handles=handles,
+            prop={"size": 11},
+            framealpha=0.9,
+            facecolor="white",
+            edgecolor="#bdc3c7",
+            loc="upper left",
+        )
+        self.canvas.draw()
 
-            self.ax.plot(
-                x,
-                y,
-                color="#c0392b",
-                linewidth=2,
-                label=f"Порог = {threshold}, k₁ = {slope_low:.1f}, k₂ = {slope_high:.1f}",
-            )
-            self.ax.set_title("Кусочно-линейное преобразование", **title_font)
+    def update_plot(self, method, correction_lut=None, **params):
+        """Обновление кривой по LUT, которой корректируется изображение"""
+        if correction_lut is None:
+            y = self.x
+        elif len(correction_lut) == lut.LEVELS:
+            y = correction_lut
+        else:
+            # 16-битная таблица: 256 узлов в 8-битной шкале графика
+            max_level = len(correction_lut) - 1
+            index = np.rint(self.x * (max_level / 255)).astype(np.intp)
+            y = correction_lut[index] * (255 / max_level)
+        self.curve.set_ydata(y)
 
-        elif method == "gaussian":
+        if method == "gaussian":
             mean = params.get("mean", 128)
             std = params.get("std", 50)
-            y = 255 * np.exp(-((x - mean) ** 2) / (2 * std**2))
-            self.ax.plot(
-                x, y, color="#8e44ad", linewidth=2, label=f"μ = {mean}, σ = {std}"
+            self.target_line.set_ydata(
+                255 * np.exp(-((self.x - mean) ** 2) / (2 * std**2))
             )
-            self.ax.set_title("Гауссово распределение", **title_font)
-
         elif method == "exponential":
             lambda_param = params.get("lambda_param", 0.05)
-            y = 255 * (1 - np.exp(-lambda_param * x))
-            self.ax.plot(
-                x, y, color="#d35400", linewidth=2, label=f"λ = {lambda_param:.2f}"
-            )
-            self.ax.set_title("Экспоненциальное распределение", **title_font)
-
-        else:
-            # Линейное преобразование (y = x)
-            self.ax.plot(x, x, color="#2c3e50", linewidth=2, label="y = x")
-            self.ax.set_title("Линейное преобразование", **title_font)
-
-        # Настройка осей и сетки
-        self.ax.grid(True, linestyle="--", alpha=0.7)
-        self.ax.set_xlabel("Входное значение", **label_font)
-        self.ax.set_ylabel("Выходное значение", **label_font)
-
-        # Настройка легенды
-        self.ax.legend(
-            prop={"size": 11}, framealpha=0.9, facecolor="white", edgecolor="#bdc3c7"
-        )
-
-        # Добавляем формулу в правом верхнем углу
-        if method != "none":
-            formula = self.get_formula(method, params)
-            self.ax.text(
-                0.98,
-                0.02,
-                formula,
-                transform=self.ax.transAxes,
-                bbox=dict(
-                    facecolor="white",
-                    alpha=0.8,
-                    edgecolor="#bdc3c7",
-                    boxstyle="round,pad=0.5",
-                ),
-                ha="right",
-                va="bottom",
-                fontsize=12,
-                color="#2c3e50",
-            )
+            self.target_line.set_ydata(255 * (1 - np.exp(-lambda_param * self.x)))
 
-        # Настройка пределов осей
-        self.ax.set_xlim(0, 255)
-        self.ax.set_ylim(0, 255)
+        self.formula_text.set_text(self.get_formula(method, params))
+        self.formula_text.set_visible(method != "none")
 
-        # Обновление холста
-        self.canvas.draw()
+        if method != self.method:
+            self.set_method(method)
+        else:
+            self.blit()
+
+    def on_draw(self, event):
+        """Запоминаем фон после полной перерисовки и дорисовываем кривые"""
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_animated()
+
+    def draw_animated(self):
+        for artist in (self.target_line, self.curve, self.formula_text):
+            if artist.get_visible():
+                self.ax.draw_artist(artist)
+
+    def blit(self):
+        """Перерисовка только кривых поверх сохраненного фона"""
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self.draw_animated()
+        self.canvas.blit(self.fig.bbox)
 
     def get_formula(self, method, params):
         """Возвращает формулу для отображения на графике"""
@@ -172,6 +200,12 @@ class FunctionVisualizer(tk.Toplevel):
                 f"Iout = {slope_low}·Iin, Iin < {threshold}"
                 f"\nIout = {slope_high}·(Iin - {threshold}) + {slope_low}·{threshold}, Iin ≥ {threshold}"
             )
+        elif method == "normalize":
+            return "y = 255·(x - min)/(max - min)"
+        elif method == "equalize":
+            return "y = 255·CDF(x)"
+        elif method == "clahe":
+            return "CLAHE - локальный метод, показана только базовая часть"
         elif method == "gaussian":
             mean = params.get("mean", 128)
             std = params.get("std", 50)
@@ -179,107 +213,105 @@ class FunctionVisualizer(tk.Toplevel):
         elif method == "exponential":
             lambda_param = params.get("lambda_param", 0.05)
             return f"y = 255·(1 - exp(-{lambda_param:.2f}·x))"
+        elif method == "reference":
+            return "y = G⁻¹(F(x))"
         return "y = x"
 
 
 class ImageCorrector:
+    """Градационные преобразования; каждое сводится к LUT (см. lut.py)
+
+    Поддерживаются 8- и 16-битные изображения (таблицы на 256 и 65536
+    уровней) и float-изображения с яркостью 0..1.
+    """
+
     @staticmethod
     def polarity(image):
         """Инверсия изображения (полярность)"""
-        img_array = np.array(image)
-        return Image.fromarray(255 - img_array)
+        return ImageCorrector.apply_recipe(image, {"basic": "polarity"})
 
     @staticmethod
     def logarithmic(image, c=45):
         """Логарифмическое преобразование"""
-        img_array = np.array(image).astype(float)
-        img_log = c * np.log(1 + img_array)
-        img_log = np.clip(img_log, 0, 255).astype(np.uint8)
-        return Image.fromarray(img_log)
+        return ImageCorrector.apply_recipe(
+            image, {"basic": "logarithmic", "basic_params": {"c": c}}
+        )
 
     @staticmethod
     def gamma(image, gamma=1.0):
         """Степенное преобразование (гамма-коррекция)"""
-        img_array = np.array(image)
-        img_gamma = exposure.adjust_gamma(img_array, gamma)
-        return Image.fromarray(img_gamma)
+        return ImageCorrector.apply_recipe(
+            image, {"basic": "gamma", "basic_params": {"gamma": gamma}}
+        )
 
     @staticmethod
     def piecewise_linear(image, threshold=128, slope_low=0.5, slope_high=1.5):
         """Кусочно-линейное преобразование"""
-        img_array = np.array(image).astype(float)
-
-        # Создаем маску для темных и светлых пикселей
-        mask_dark = img_array < threshold
-        mask_light = ~mask_dark
-
-        # Применяем разные наклоны
-        result = np.zeros_like(img_array)
-        result[mask_dark] = slope_low * img_array[mask_dark]
-        result[mask_light] = threshold + slope_high * (
-            img_array[mask_light] - threshold
+        params = {
+            "threshold": threshold,
+            "slope_low": slope_low,
+            "slope_high": slope_high,
+        }
+        return ImageCorrector.apply_recipe(
+            image, {"basic": "piecewise_linear", "basic_params": params}
         )
 
-        # Нормализация в диапазон [0, 255]
-        result = np.clip(result, 0, 255).astype(np.uint8)
-        return Image.fromarray(result)
-
     @staticmethod
     def normalize(image):
         """Нормализация гистограммы"""
-        img_array = np.array(image)
-        img_norm = cv2.normalize(img_array, None, 0, 255, cv2.NORM_MINMAX)
-        return Image.fromarray(img_norm)
+        return ImageCorrector.apply_recipe(image, {"hist": "normalize"})
 
     @staticmethod
     def equalize(image):
         """Эквализация гистограммы"""
-        img_array = np.array(image)
-        img_eq = cv2.equalizeHist(img_array)
-        return Image.fromarray(img_eq)
+        return ImageCorrector.apply_recipe(image, {"hist": "equalize"})
+
+    @staticmethod
+    def clahe(image, clip_limit=2.0, tile_grid=8):
+        """Адаптивная эквализация с ограничением контраста (по плиткам)"""
+        params = {"clip_limit": clip_limit, "tile_grid": tile_grid}
+        return ImageCorrector.apply_recipe(
+            image, {"hist": "clahe", "hist_params": params}
+        )
 
     @staticmethod
     def gaussian_mapping(image, mean=128, std=50):
         """Приведение к гауссовому распределению"""
-        img_array = np.array(image)
-
-        # Создаем целевое гауссово распределение
-        x = np.arange(256)
-        target_hist = np.exp(-((x - mean) ** 2) / (2 * std**2))
-        target_hist = target_hist / np.sum(target_hist)
-
-        # Вычисляем кумулятивную функцию распределения
-        cdf = np.cumsum(target_hist)
-
-        # Нормализуем CDF
-        cdf = cdf * 255
-
-        # Применяем преобразование
-        img_mapped = cdf[img_array]
-        return Image.fromarray(img_mapped.astype(np.uint8))
+        params = {"mean": mean, "std": std}
+        return ImageCorrector.apply_recipe(
+            image, {"hist": "gaussian_mapping", "hist_params": params}
+        )
 
     @staticmethod
     def exponential_mapping(image, lambda_param=0.05):
         """Приведение к экспоненциальному распределению"""
-        img_array = np.array(image)
-
-        # Создаем целевое экспоненциальное распределение
-        x = np.arange(256)
-        target_hist = lambda_param * np.exp(-lambda_param * x)
-        target_hist = target_hist / np.sum(target_hist)
-
-        # Вычисляем кумулятивную функцию распределения
-        cdf = np.cumsum(target_hist)
+        params = {"lambda_param": lambda_param}
+        return ImageCorrector.apply_recipe(
+            image, {"hist": "exponential_mapping", "hist_params": params}
+        )
 
-        # Нормализуем CDF
-        cdf = cdf * 255
+    @staticmethod
+    def reference_mapping(image, reference_path):
+        """Приведение к гистограмме эталонного изображения"""
+        params = {"reference": reference_path}
+        return ImageCorrector.apply_recipe(
+            image, {"hist": "reference_mapping", "hist_params": params}
+        )
 
-        # Применяем преобразование
-        img_mapped = cdf[img_array]
-        return Image.fromarray(img_mapped.astype(np.uint8))
+    @staticmethod
+    def apply_recipe(image, recipe):
+        """Цепочка преобразований, скомпилированная в одну LUT"""
+        img_array = lut.to_array(image)
+        hist = lut.histogram(img_array) if lut.needs_histogram(recipe) else None
+        # to_array возвращает копию, поэтому коррекция идет на месте
+        result, _ = lut.correct_array(img_array, recipe, hist, out=img_array)
+        return Image.fromarray(result)
 
 
 class ImageViewer:
+    # Размер области просмотра
+    DISPLAY_SIZE = (600, 400)
+
     def __init__(self, root):
         self.root = root
         self.root.title("Градационная коррекция чёрно-белых изображений")
@@ -295,6 +327,26 @@ class ImageViewer:
         self.current_image = None
         self.original_image = None
 
+        # Гистограммы загруженных изображений (путь -> 256 уровней для 8 бит,
+        # 65536 для 16-битных и float)
+        self.histogram_cache = {}
+        self.original_hist = None
+
+        # LUT последней выполненной коррекции (для графика функции)
+        self.current_lut = None
+
+        # Уменьшенные копии для просмотра (путь -> массив): коррекции
+        # поточечные, поэтому интерактивно LUT применяется только к копии
+        self.proxy_cache = {}
+        self.display_proxy = None
+        self.display_photo = None
+
+        # Коррекция в фоне с объединением серий событий слайдеров
+        self.scheduler = CorrectionScheduler(
+            root, self.compute_correction, self.render_correction
+        )
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Создаем главные контейнеры
         self.main_frame = Frame(root)
         self.main_frame.pack(expand=True, fill=tk.BOTH, padx=5, pady=5)
@@ -353,6 +405,12 @@ class ImageViewer:
         )
         self.btn_change_folder.pack(pady=10, fill=tk.X)
 
+        # Кнопка сохранения результата в полном разрешении
+        self.btn_save = tk.Button(
+            self.left_frame, text="Сохранить результат", command=self.save_result
+        )
+        self.btn_save.pack(pady=5, fill=tk.X)
+
         # Фрейм для формул
         self.formula_frame = LabelFrame(
             self.left_frame, text="Формула преобразования", bg="#f8f8f8", height=120
@@ -360,6 +418,18 @@ class ImageViewer:
         self.formula_frame.pack(fill=tk.X, pady=5, padx=5)
         self.formula_frame.pack_propagate(False)
 
+        # Автоматический подбор коррекции по гистограмме
+        self.auto_var = tk.BooleanVar(value=False)
+        self.auto_notes = []
+        self.auto_check = tk.Checkbutton(
+            self.left_frame,
+            text="Автокоррекция по гистограмме",
+            variable=self.auto_var,
+            command=self.apply_correction,
+            bg="lightgray",
+        )
+        self.auto_check.pack(fill=tk.X, pady=5, padx=5)
+
         # Фрейм для базовых преобразований
         self.basic_frame = LabelFrame(
             self.left_frame, text="Базовые преобразования", bg="#f0f8ff"
@@ -393,6 +463,7 @@ class ImageViewer:
                 "Без коррекции",
                 "Нормализация",
                 "Эквализация",
+                "Адаптивная эквализация (CLAHE)",
                 "Приведение к заданной функции",
             ],
             state="readonly",
@@ -409,13 +480,21 @@ class ImageViewer:
 
         self.dist_method = ttk.Combobox(
             self.function_frame,
-            values=["Гауссова", "Экспоненциальная"],
+            values=["Гауссова", "Экспоненциальная", "Эталонное изображение"],
             state="readonly",
         )
         self.dist_method.set("Гауссова")
         self.dist_method.pack(fill=tk.X, pady=5, padx=5)
         self.dist_method.bind("<<ComboboxSelected>>", self.on_dist_method_change)
 
+        # Эталонное изображение для приведения гистограммы
+        self.reference_path = None
+        self.btn_reference = tk.Button(
+            self.function_frame,
+            text="Выбрать эталон",
+            command=self.choose_reference,
+        )
+
         # Кнопка для показа/скрытия окна визуализации
         self.btn_show_visualizer = tk.Button(
             self.left_frame,
@@ -568,6 +647,43 @@ class ImageViewer:
         self.lambda_scale.set(0.05)
         self.lambda_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
+        # Параметры для адаптивной эквализации (CLAHE)
+        self.clahe_frame = Frame(self.params_frame, bg="lightgray")
+
+        # Порог ограничения контраста
+        self.clip_frame = Frame(self.clahe_frame, bg="lightgray")
+        self.clip_label = Label(
+            self.clip_frame, text="Порог клиппинга:", bg="lightgray"
+        )
+        self.clip_label.pack(side=tk.LEFT)
+        self.clip_value = Label(self.clip_frame, text="2.0", bg="lightgray")
+        self.clip_value.pack(side=tk.RIGHT)
+        self.clip_scale = ttk.Scale(
+            self.clip_frame,
+            from_=1.0,
+            to=10.0,
+            orient=tk.HORIZONTAL,
+            command=self.update_clip_limit,
+        )
+        self.clip_scale.set(2.0)
+        self.clip_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        # Размер сетки плиток
+        self.grid_frame = Frame(self.clahe_frame, bg="lightgray")
+        self.grid_label = Label(self.grid_frame, text="Сетка плиток:", bg="lightgray")
+        self.grid_label.pack(side=tk.LEFT)
+        self.grid_value = Label(self.grid_frame, text="8x8", bg="lightgray")
+        self.grid_value.pack(side=tk.RIGHT)
+        self.grid_scale = ttk.Scale(
+            self.grid_frame,
+            from_=2,
+            to=32,
+            orient=tk.HORIZONTAL,
+            command=self.update_tile_grid,
+        )
+        self.grid_scale.set(8)
+        self.grid_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
         # Текстовое поле для анализа изображения
         self.analysis_label = Label(
             self.bottom_frame, text="Анализ изображения:", font=("Arial", 10, "bold")
@@ -585,6 +701,7 @@ class ImageViewer:
         if self.function_visualizer.state() == "withdrawn":
             self.function_visualizer.deiconify()
             self.btn_show_visualizer.config(text="Скрыть визуализацию функции")
+            self.update_function_visualization()
         else:
             self.function_visualizer.withdraw()
             self.btn_show_visualizer.config(text="Показать визуализацию функции")
@@ -621,9 +738,18 @@ class ImageViewer:
                 mean = float(self.mean_scale.get())
                 std = float(self.std_scale.get())
                 formula = f"PDF(x) = \\frac{{1}}{{\\sigma\\sqrt{{2\\pi}}}} \\cdot e^{{-\\frac{{(x-\\mu)^2}}{{2\\sigma^2}}}} \\\\ \\mu = {mean}, \\sigma = {std}"
-            else:  # Экспоненциальная
+            elif dist_method == "Экспоненциальная":
                 lambda_param = float(self.lambda_scale.get())
                 formula = f"PDF(x) = \\lambda \\cdot e^{{-\\lambda x}} \\\\ \\lambda = {lambda_param}"
+            else:  # Эталонное изображение
+                formula = "I_{out} = G_{ref}^{-1}(F(I_{in}))"
+        elif hist_method == "Адаптивная эквализация (CLAHE)":
+            clip_limit = float(self.clip_scale.get())
+            grid = int(float(self.grid_scale.get()))
+            formula = (
+                f"I_{{out}} = CLAHE(I_{{in}}), \\\\ clip = {clip_limit:.1f}, "
+                f"grid = {grid} \\times {grid}"
+            )
         else:
             formula = "Выберите метод преобразования"
 
@@ -676,6 +802,10 @@ class ImageViewer:
         self.mean_frame.pack_forget()
         self.std_frame.pack_forget()
         self.exp_frame.pack_forget()
+        self.clahe_frame.pack_forget()
+        self.clip_frame.pack_forget()
+        self.grid_frame.pack_forget()
+        self.btn_reference.pack_forget()
         self.function_frame.pack_forget()
 
         # Показываем нужные элементы в зависимости от выбранных методов
@@ -692,6 +822,11 @@ class ImageViewer:
             self.slope_low_frame.pack(fill=tk.X, pady=5)
             self.slope_high_frame.pack(fill=tk.X, pady=5)
 
+        if hist_method == "Адаптивная эквализация (CLAHE)":
+            self.clahe_frame.pack(fill=tk.X, pady=5)
+            self.clip_frame.pack(fill=tk.X, pady=5)
+            self.grid_frame.pack(fill=tk.X, pady=5)
+
         if hist_method == "Приведение к заданной функции":
             self.function_frame.pack(fill=tk.X, pady=5)
 
@@ -699,89 +834,99 @@ class ImageViewer:
                 self.gaussian_frame.pack(fill=tk.X, pady=5)
                 self.mean_frame.pack(fill=tk.X, pady=5)
                 self.std_frame.pack(fill=tk.X, pady=5)
-            else:  # Экспоненциальная
+            elif self.dist_method.get() == "Экспоненциальная":
                 self.exp_frame.pack(fill=tk.X, pady=5)
+            else:  # Эталонное изображение
+                self.btn_reference.pack(fill=tk.X, pady=5, padx=5)
 
         # Обновляем формулу
         self.update_formula()
 
-        # Обновляем визуализацию функции
-        self.update_function_visualization()
-
+        # График функции обновится вместе с результатом коррекции
         self.apply_correction()
 
     def update_function_visualization(self):
-        """Обновление визуализации функции в зависимости от выбранного метода"""
+        """Обновление визуализации функции в зависимости от выбранного метода
+
+        Кривая строится по той же LUT, что применена к изображению
+        (self.current_lut), поэтому график и картинка всегда согласованы.
+        """
         if not hasattr(self, "function_visualizer"):
             self.function_visualizer = FunctionVisualizer(self)
 
+        # Скрытое окно не перерисовываем: обновится при показе
+        if self.function_visualizer.state() == "withdrawn":
+            return
+
+        params = {}
         method = self.basic_method.get()
+        hist_method = self.hist_method.get()
+        dist_method = self.dist_method.get()
         if method == "Логарифмическое":
-            c = float(self.log_scale.get())
-            self.function_visualizer.update_plot("logarithmic", c=c)
+            method = "logarithmic"
+            params = {"c": float(self.log_scale.get())}
         elif method == "Степенное (гамма)":
-            gamma = float(self.gamma_scale.get())
-            self.function_visualizer.update_plot("power", gamma=gamma)
+            method = "power"
+            params = {"gamma": float(self.gamma_scale.get())}
         elif method == "Кусочно-линейное":
-            threshold = float(self.threshold_scale.get())
-            slope_low = float(self.slope_low_scale.get())
-            slope_high = float(self.slope_high_scale.get())
-            self.function_visualizer.update_plot(
-                "piecewise",
-                threshold=threshold,
-                slope_low=slope_low,
-                slope_high=slope_high,
-            )
-        elif (
-            self.hist_method.get() == "Приведение к заданной функции"
-            and self.dist_method.get() == "Гауссова"
-        ):
-            mean = float(self.mean_scale.get())
-            std = float(self.std_scale.get())
-            self.function_visualizer.update_plot("gaussian", mean=mean, std=std)
-        elif (
-            self.hist_method.get() == "Приведение к заданной функции"
-            and self.dist_method.get() == "Экспоненциальная"
-        ):
-            lambda_param = float(self.lambda_scale.get())
-            self.function_visualizer.update_plot(
-                "exponential", lambda_param=lambda_param
-            )
+            method = "piecewise"
+            params = {
+                "threshold": float(self.threshold_scale.get()),
+                "slope_low": float(self.slope_low_scale.get()),
+                "slope_high": float(self.slope_high_scale.get()),
+            }
+        elif hist_method == "Нормализация":
+            method = "normalize"
+        elif hist_method == "Эквализация":
+            method = "equalize"
+        elif hist_method == "Адаптивная эквализация (CLAHE)":
+            method = "clahe"
+        elif hist_method == "Приведение к заданной функции":
+            if dist_method == "Гауссова":
+                method = "gaussian"
+                params = {
+                    "mean": float(self.mean_scale.get()),
+                    "std": float(self.std_scale.get()),
+                }
+            elif dist_method == "Экспоненциальная":
+                method = "exponential"
+                params = {"lambda_param": float(self.lambda_scale.get())}
+            else:  # Эталонное изображение
+                method = "reference"
+        else:
+            method = "none"
+
+        self.function_visualizer.update_plot(method, self.current_lut, **params)
 
     def update_log(self, value):
         """Обновление значения логарифмического преобразования"""
         self.log_value.config(text=f"{float(value):.0f}")
         if self.basic_method.get() == "Логарифмическое":
-            self.apply_correction()
-            self.update_function_visualization()
+            self.schedule_correction()
 
     def update_gamma(self, value):
         """Обновление значения гамма-коррекции"""
         self.gamma_value.config(text=f"{float(value):.1f}")
         if self.basic_method.get() == "Степенное (гамма)":
-            self.apply_correction()
-            self.update_function_visualization()
+            self.schedule_correction()
 
     def update_threshold(self, value):
         """Обновление значения порога для кусочно-линейного преобразования"""
         self.threshold_value.config(text=f"{float(value):.0f}")
         if self.basic_method.get() == "Кусочно-линейное":
-            self.apply_correction()
-            self.update_function_visualization()
+            self.schedule_correction()
 
     def update_slope_low(self, value):
         """Обновление значения наклона для темных пикселей"""
         self.slope_low_value.config(text=f"{float(value):.1f}")
         if self.basic_method.get() == "Кусочно-линейное":
-            self.apply_correction()
-            self.update_function_visualization()
+            self.schedule_correction()
 
     def update_slope_high(self, value):
         """Обновление значения наклона для светлых пикселей"""
         self.slope_high_value.config(text=f"{float(value):.1f}")
         if self.basic_method.get() == "Кусочно-линейное":
-            self.apply_correction()
-            self.update_function_visualization()
+            self.schedule_correction()
 
     def update_mean(self, value):
         """Обновление значения среднего для гауссова распределения"""
@@ -790,8 +935,7 @@ class ImageViewer:
             self.hist_method.get() == "Приведение к заданной функции"
             and self.dist_method.get() == "Гауссова"
         ):
-            self.apply_correction()
-            self.update_function_visualization()
+            self.schedule_correction()
 
     def update_std(self, value):
         """Обновление значения стандартного отклонения для гауссова распределения"""
@@ -800,8 +944,7 @@ class ImageViewer:
             self.hist_method.get() == "Приведение к заданной функции"
             and self.dist_method.get() == "Гауссова"
         ):
-            self.apply_correction()
-            self.update_function_visualization()
+            self.schedule_correction()
 
     def update_lambda(self, value):
         """Обновление значения λ для экспоненциального распределения"""
@@ -810,52 +953,116 @@ class ImageViewer:
             self.hist_method.get() == "Приведение к заданной функции"
             and self.dist_method.get() == "Экспоненциальная"
         ):
-            self.apply_correction()
-            self.update_function_visualization()
-
-    def apply_correction(self, event=None):
-        """Применение выбранных методов коррекции"""
-        if not self.original_image:
-            return
-
-        # Начинаем с оригинального изображения
-        img = self.original_image
+            self.schedule_correction()
+
+    def update_clip_limit(self, value):
+        """Обновление порога ограничения контраста CLAHE"""
+        self.clip_value.config(text=f"{float(value):.1f}")
+        if self.hist_method.get() == "Адаптивная эквализация (CLAHE)":
+            self.schedule_correction()
+
+    def update_tile_grid(self, value):
+        """Обновление размера сетки плиток CLAHE"""
+        grid = int(float(value))
+        self.grid_value.config(text=f"{grid}x{grid}")
+        if self.hist_method.get() == "Адаптивная эквализация (CLAHE)":
+            self.schedule_correction()
+
+    def get_recipe(self):
+        """Рецепт коррекции по текущему состоянию интерфейса"""
+        if self.auto_var.get() and self.original_hist is not None:
+            # Параметры выводятся из кэшированной гистограммы, а не из слайдеров
+            recipe, self.auto_notes = auto_recipe(self.original_hist)
+            return recipe
+
+        recipe = {
+            "basic": "none",
+            "basic_params": {},
+            "hist": "none",
+            "hist_params": {},
+        }
 
-        # Применяем базовое преобразование
         basic_method = self.basic_method.get()
         if basic_method == "Полярность":
-            img = ImageCorrector.polarity(img)
+            recipe["basic"] = "polarity"
         elif basic_method == "Логарифмическое":
-            c = float(self.log_scale.get())
-            img = ImageCorrector.logarithmic(img, c)
+            recipe["basic"] = "logarithmic"
+            recipe["basic_params"] = {"c": float(self.log_scale.get())}
         elif basic_method == "Степенное (гамма)":
-            gamma = float(self.gamma_scale.get())
-            img = ImageCorrector.gamma(img, gamma)
+            recipe["basic"] = "gamma"
+            recipe["basic_params"] = {"gamma": float(self.gamma_scale.get())}
         elif basic_method == "Кусочно-линейное":
-            threshold = float(self.threshold_scale.get())
-            slope_low = float(self.slope_low_scale.get())
-            slope_high = float(self.slope_high_scale.get())
-            img = ImageCorrector.piecewise_linear(img, threshold, slope_low, slope_high)
+            recipe["basic"] = "piecewise_linear"
+            recipe["basic_params"] = {
+                "threshold": float(self.threshold_scale.get()),
+                "slope_low": float(self.slope_low_scale.get()),
+                "slope_high": float(self.slope_high_scale.get()),
+            }
 
-        # Применяем коррекцию гистограммы
         hist_method = self.hist_method.get()
         if hist_method == "Нормализация":
-            img = ImageCorrector.normalize(img)
+            recipe["hist"] = "normalize"
         elif hist_method == "Эквализация":
-            img = ImageCorrector.equalize(img)
+            recipe["hist"] = "equalize"
+        elif hist_method == "Адаптивная эквализация (CLAHE)":
+            recipe["hist"] = "clahe"
+            recipe["hist_params"] = {
+                "clip_limit": float(self.clip_scale.get()),
+                "tile_grid": int(float(self.grid_scale.get())),
+            }
         elif hist_method == "Приведение к заданной функции":
             if self.dist_method.get() == "Гауссова":
-                mean = float(self.mean_scale.get())
-                std = float(self.std_scale.get())
-                img = ImageCorrector.gaussian_mapping(img, mean, std)
-            else:  # Экспоненциальная
-                lambda_param = float(self.lambda_scale.get())
-                img = ImageCorrector.exponential_mapping(img, lambda_param)
+                recipe["hist"] = "gaussian_mapping"
+                recipe["hist_params"] = {
+                    "mean": float(self.mean_scale.get()),
+                    "std": float(self.std_scale.get()),
+                }
+            elif self.dist_method.get() == "Экспоненциальная":
+                recipe["hist"] = "exponential_mapping"
+                recipe["hist_params"] = {"lambda_param": float(self.lambda_scale.get())}
+            elif self.reference_path:  # Эталонное изображение
+                recipe["hist"] = "reference_mapping"
+                recipe["hist_params"] = {"reference": self.reference_path}
+
+        return recipe
+
+    def apply_correction(self, event=None):
+        """Применение выбранных методов коррекции (без задержки)"""
+        self.schedule_correction(delay_ms=0)
+
+    def schedule_correction(self, delay_ms=None):
+        """Запрос коррекции; параметры снимаются в потоке Tk"""
+        if not self.original_image:
+            return
 
+        self.scheduler.request(
+            self.display_proxy,
+            self.original_hist,
+            self.get_recipe(),
+            delay_ms=delay_ms,
+        )
+
+    @staticmethod
+    def compute_correction(proxy, hist, recipe):
+        """Расчет коррекции в фоновом потоке (без обращения к Tk)"""
+        # Базовое и гистограммное преобразования сводятся в одну LUT,
+        # которая применяется только к уменьшенной копии. Гистограмма
+        # результата - перенос полной гистограммы оригинала через LUT,
+        # поэтому статистика точная; для локальных методов (CLAHE)
+        # она считается по копии
+        correction_lut = lut.compile_recipe(recipe, hist)
+        result, result_hist = lut.correct_array(proxy, recipe, hist, correction_lut)
+        # На экран - всегда 8 бит, коррекция шла в родной глубине
+        return Image.fromarray(lut.to_uint8(result)), result_hist, correction_lut
+
+    def render_correction(self, result):
+        """Вывод самого свежего результата коррекции"""
+        img, hist, self.current_lut = result
         self.current_image = img
         self.display_image(img)
-        self.plot_histogram(img)
-        self.analyze_image(img)
+        self.plot_histogram(hist)
+        self.analyze_image(img, hist)
+        self.update_function_visualization()
 
     def show_image_and_histogram(self, event):
         """Отображаем выбранное изображение и его гистограмму"""
@@ -869,6 +1076,19 @@ class ImageViewer:
         try:
             self.original_image = Image.open(image_path)
             self.current_image = self.original_image
+
+            # Единственный проход по пикселям для гистограммы и уменьшенной
+            # копии - при первой загрузке; массив в родной глубине (8/16 бит)
+            if (
+                image_path not in self.histogram_cache
+                or image_path not in self.proxy_cache
+            ):
+                img_array = lut.to_array(self.original_image)
+                self.histogram_cache[image_path] = lut.histogram(img_array)
+                self.proxy_cache[image_path] = self.make_display_proxy(img_array)
+            self.original_hist = self.histogram_cache[image_path]
+            self.display_proxy = self.proxy_cache[image_path]
+
             self.apply_correction(None)
         except Exception as e:
             print(f"Ошибка при загрузке изображения: {e}")
@@ -882,7 +1102,9 @@ class ImageViewer:
                 f
                 for f in files
                 if f.startswith("bw_")
-                and f.lower().endswith((".png", ".jpg", ".jpeg", ".bmp", ".gif"))
+                and f.lower().endswith(
+                    (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tif", ".tiff")
+                )
             ]
 
             for img in bw_images:
@@ -893,14 +1115,14 @@ class ImageViewer:
         except Exception as e:
             print(f"Ошибка при загрузке изображений: {e}")
 
-    def display_image(self, img):
-        """Отображаем изображение с фиксированными размерами"""
-        # Фиксированные размеры для отображения
-        display_width = 600
-        display_height = 400
+    @classmethod
+    def make_display_proxy(cls, img_array):
+        """Уменьшенная копия с сохранением пропорций (в глубине оригинала)"""
+        display_width, display_height = cls.DISPLAY_SIZE
+        height, width = img_array.shape[:2]
 
         # Вычисляем новые размеры с сохранением пропорций
-        img_ratio = img.width / img.height
+        img_ratio = width / height
         display_ratio = display_width / display_height
 
         if display_ratio > img_ratio:
@@ -910,28 +1132,40 @@ class ImageViewer:
             new_width = display_width
             new_height = int(new_width / img_ratio)
 
-        # Изменяем размер изображения
-        img = img.resize((new_width, new_height), Image.LANCZOS)
+        # cv2.resize работает с uint8, uint16 и float32 без приведения к 8 бит
+        interpolation = cv2.INTER_AREA if new_width < width else cv2.INTER_LANCZOS4
+        return cv2.resize(
+            img_array, (new_width, new_height), interpolation=interpolation
+        )
+
+    def display_image(self, img):
+        """Отображаем уменьшенную копию по центру области просмотра"""
+        display_width, display_height = self.DISPLAY_SIZE
 
         # Создаем новое изображение с черным фоном нужного размера
         background = Image.new("L", (display_width, display_height), 0)
 
         # Вычисляем позицию для центрирования изображения
-        x = (display_width - new_width) // 2
-        y = (display_height - new_height) // 2
+        x = (display_width - img.width) // 2
+        y = (display_height - img.height) // 2
 
         # Вставляем изображение в центр фона
         background.paste(img, (x, y))
 
-        # Конвертируем в формат для отображения
-        photo = ImageTk.PhotoImage(background)
-        self.image_label.config(image=photo)
-        self.image_label.image = photo
+        # Размер области не меняется, поэтому PhotoImage создается один раз
+        if self.display_photo is None:
+            self.display_photo = ImageTk.PhotoImage(background)
+            self.image_label.config(image=self.display_photo)
+            self.image_label.image = self.display_photo
+        else:
+            self.display_photo.paste(background)
 
-    def plot_histogram(self, img):
-        """Строим гистограмму для черно-белого изображения"""
-        img_array = np.array(img)
+    def plot_histogram(self, hist):
+        """Строим гистограмму для черно-белого изображения по готовым счетчикам"""
         self.ax.clear()
+        # 16-битные гистограммы показываем в 8-битной шкале
+        hist = lut.reduce_histogram(hist)
+        edges = np.arange(len(hist) + 1)
 
         # Определяем, нужно ли показывать две гистограммы
         show_original = self.basic_method.get() == "Кусочно-линейное" or (
@@ -939,21 +1173,20 @@ class ImageViewer:
             and self.dist_method.get() == "Гауссова"
         )
 
-        if show_original and self.original_image is not None:
+        if show_original and self.original_hist is not None:
             # Строим две гистограммы
-            original_array = np.array(self.original_image)
-            self.ax.hist(
-                original_array.ravel(),
-                bins=256,
-                range=(0, 256),
+            self.ax.stairs(
+                lut.reduce_histogram(self.original_hist),
+                edges,
+                fill=True,
                 color="gray",
                 alpha=0.5,
                 label="До коррекции",
             )
-            self.ax.hist(
-                img_array.ravel(),
-                bins=256,
-                range=(0, 256),
+            self.ax.stairs(
+                hist,
+                edges,
+                fill=True,
                 color="black",
                 alpha=0.7,
                 label="После коррекции",
@@ -961,9 +1194,7 @@ class ImageViewer:
             self.ax.legend()
         else:
             # Строим одну гистограмму
-            self.ax.hist(
-                img_array.ravel(), bins=256, range=(0, 256), color="black", alpha=0.7
-            )
+            self.ax.stairs(hist, edges, fill=True, color="black", alpha=0.7)
 
         self.ax.set_title("Гистограмма")
         self.ax.set_xlabel("Уровень яркости")
@@ -974,75 +1205,79 @@ class ImageViewer:
         self.fig.tight_layout(pad=2)
         self.canvas.draw()
 
-    def analyze_image(self, img):
+    def analyze_image(self, img, hist):
         """Улучшенный анализ изображения с детальной проверкой гистограммы"""
 
-        img_array = np.array(img)
-        width, height = img.size
-        depth = img_array.itemsize * 8
-
-        # Анализ гистограммы
-        hist, bins = np.histogram(img_array, bins=256, range=(0, 256))
-        total_pixels = width * height
+        # Все показатели берутся из гистограммы, без прохода по пикселям
+        stats = histogram_stats(hist)
+        # Размер оригинала: на экране только уменьшенная копия
+        width, height = self.original_image.size
+        depth = stats["depth"]
+        total_pixels = stats["total"]
 
         # Основные параметры
         analysis = f"▌ Анализ изображения {width}x{height}px, {depth} бит\n"
         analysis += f"▌ Общее количество пикселей: {total_pixels:,}\n"
 
         # 1. Проверка на полностью чёрное/белое изображение
-        if np.all(img_array == 0):
+        if stats["all_black"]:
             self.analysis_text.delete(1.0, END)
             self.analysis_text.insert(END, "▌ ВНИМАНИЕ: Полностью чёрное изображение!")
             return
-        elif np.all(img_array == 255):
+        elif stats["all_white"]:
             self.analysis_text.delete(1.0, END)
             self.analysis_text.insert(END, "▌ ВНИМАНИЕ: Полностью белое изображение!")
             return
 
         # 2. Анализ распределения яркостей
-        dark_threshold = int(0.1 * 255)  # Порог для теней
-        light_threshold = int(0.9 * 255)  # Порог для светов
+        dark_threshold = stats["dark_threshold"]  # Порог для теней
+        light_threshold = stats["light_threshold"]  # Порог для светов
 
-        dark_pixels = np.sum(hist[:dark_threshold])
-        light_pixels = np.sum(hist[light_threshold:])
-        mid_pixels = np.sum(hist[dark_threshold:light_threshold])
+        dark_pixels = stats["dark"]
+        light_pixels = stats["light"]
+        mid_pixels = stats["mid"]
 
         analysis += f"\n▌ Распределение тонов:\n"
         analysis += f"• Тени (0-{dark_threshold}): {dark_pixels/total_pixels:.1%}\n"
         analysis += f"• Средние тона: {mid_pixels/total_pixels:.1%}\n"
         analysis += (
-            f"• Света ({light_threshold}-255): {light_pixels/total_pixels:.1%}\n"
+            f"• Света ({light_threshold}-{stats['levels'] - 1}): "
+            f"{light_pixels/total_pixels:.1%}\n"
         )
 
         # 3. Поиск проблем и рекомендации
         problems = []
         recommendations = []
 
+        diagnostics = diagnose(stats)
+
         # Проверка на переэкспонирование (пересветы)
-        if light_pixels > 0.3 * total_pixels:
+        if diagnostics["over_exposed"]:
             problems.append("Переэкспонирование: более 30% пикселей в ярких областях")
             recommendations.append(
                 "• Рекомендуется: Логарифмическая коррекция (для восстановления деталей в светах)"
             )
 
         # Проверка на недоэкспонирование (недосвет)
-        if dark_pixels > 0.3 * total_pixels:
+        if diagnostics["under_exposed"]:
             problems.append("Недоэкспонирование: более 30% пикселей в тёмных областях")
             recommendations.append(
                 "• Рекомендуется: Гамма-коррекция (gamma < 1.0 для осветления теней)"
             )
 
         # Проверка на низкий контраст
-        dynamic_range = np.max(img_array) - np.min(img_array)
-        if dynamic_range < 100:
-            problems.append(f"Низкий контраст (диапазон всего {dynamic_range} из 255)")
+        dynamic_range = stats["dynamic_range"]
+        if diagnostics["low_contrast"]:
+            problems.append(
+                f"Низкий контраст (диапазон всего {dynamic_range} из {stats['levels'] - 1})"
+            )
             recommendations.append(
                 "• Рекомендуется: Линейное растяжение (для увеличения контраста)"
             )
 
         # Проверка на постеризацию
-        unique_values = len(np.unique(img_array))
-        if unique_values < 100:
+        unique_values = stats["unique_levels"]
+        if diagnostics["posterized"]:
             problems.append(f"Постеризация: только {unique_values} уникальных оттенков")
             recommendations.append(
                 "• Рекомендуется: S-образная коррекция (для сглаживания переходов)"
@@ -1066,9 +1301,39 @@ class ImageViewer:
                 "• Рекомендуется: Без коррекции (изображение не требует обработки)"
             )
 
+        if self.auto_var.get():
+            analysis += "\n\n▌ Автокоррекция (по исходной гистограмме):\n"
+            for note in self.auto_notes:
+                analysis += f"• {note}\n"
+
         self.analysis_text.delete(1.0, END)
         self.analysis_text.insert(END, analysis)
 
+    def save_result(self):
+        """Сохранение результата в полном разрешении"""
+        if not self.original_image:
+            return
+
+        path = filedialog.asksaveasfilename(
+            initialdir=self.folder_path,
+            defaultextension=".png",
+            filetypes=[("Image files", "*.png *.jpg *.jpeg *.bmp *.tif *.tiff")],
+        )
+        if not path:
+            return
+
+        try:
+            # Полное разрешение обрабатывается только при сохранении;
+            # to_array возвращает копию, поэтому коррекция идет на месте
+            img_array = lut.to_array(self.original_image)
+            result, _ = lut.correct_array(
+                img_array, self.get_recipe(), self.original_hist, out=img_array
+            )
+            Image.fromarray(result).save(path)
+            print(f"Сохранено: {path}")
+        except Exception as e:
+            print(f"Ошибка при сохранении изображения: {e}")
+
     def change_folder(self):
         """Меняем папку с изображениями"""
         folder = filedialog.askdirectory(initialdir=self.folder_path)
@@ -1076,23 +1341,40 @@ class ImageViewer:
             self.folder_path = folder
             self.load_images()
 
+    def on_close(self):
+        self.scheduler.shutdown()
+        self.root.destroy()
+
     def on_basic_method_change(self, event=None):
         """Обработчик изменения базового метода преобразования"""
         self.update_correction_ui()
         self.apply_correction()
-        self.update_function_visualization()
 
     def on_hist_method_change(self, event=None):
         """Обработчик изменения метода коррекции гистограммы"""
         self.update_correction_ui()
         self.apply_correction()
-        self.update_function_visualization()
+
+    def choose_reference(self):
+        """Выбор эталонного изображения для приведения гистограммы"""
+        path = filedialog.askopenfilename(
+            initialdir=self.folder_path,
+            filetypes=[("Image files", "*.png *.jpg *.jpeg *.bmp *.gif *.tif *.tiff")],
+        )
+        if path:
+            self.reference_path = path
+            self.btn_reference.config(text=f"Эталон: {os.path.basename(path)}")
+            self.apply_correction()
 
     def on_dist_method_change(self, event=None):
         """Обработчик изменения метода распределения"""
+        if (
+            self.dist_method.get() == "Эталонное изображение"
+            and not self.reference_path
+        ):
+            self.choose_reference()
         self.update_correction_ui()
         self.apply_correction()
-        self.update_function_visualization()
 
 
 if __name__ == "__main__":